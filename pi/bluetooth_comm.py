@@ -11,6 +11,8 @@ import threading
 from typing import Optional, Callable
 import os
 
+from clock import SYSTEM_CLOCK
+
 # Check if running on Raspberry Pi
 IS_RASPBERRY_PI = os.path.exists('/proc/device-tree/model')
 
@@ -245,13 +247,15 @@ class BluetoothManager:
     High-level Bluetooth manager with automatic fallback to simulation.
     """
     
-    def __init__(self, force_simulation: bool = False):
+    def __init__(self, force_simulation: bool = False, clock=None):
         """
         Initialize Bluetooth manager.
         
         Args:
             force_simulation: Force simulation mode even on Pi
+            clock: Time source for message timestamps (default: SYSTEM_CLOCK)
         """
+        self.clock = clock or SYSTEM_CLOCK
         self.simulation_mode = force_simulation or not IS_RASPBERRY_PI or not SERIAL_AVAILABLE
         
         if self.simulation_mode:
@@ -312,7 +316,7 @@ class BluetoothManager:
         payload = {
             "type": "ERROR",
             "message": error_message,
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%S")
+            "ts": self.clock.now().strftime("%Y-%m-%dT%H:%M:%S")
         }
         
         return self._driver.send(payload)
@@ -330,7 +334,7 @@ class BluetoothManager:
         payload = {
             "type": "STATUS",
             "status": status,
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%S")
+            "ts": self.clock.now().strftime("%Y-%m-%dT%H:%M:%S")
         }
         
         return self._driver.send(payload)
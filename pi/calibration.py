@@ -0,0 +1,294 @@
+"""
+Aqua-Mind Calibration
+=====================
+Multi-point sensor calibration compiled into lookup tables.
+
+Each analog channel has a piecewise-linear curve from raw MCP3008 counts
+to engineering units. The curve is compiled once into a 1024-entry table
+(one entry per ADC code), so converting a sample is a single index and a
+burst is a single map over the table.
+
+TDS temperature compensation uses the standard linear model
+    ppm_25 = ppm / (1 + alpha * (T - 25))
+with one compensated table cached per whole degree.
+"""
+
+import json
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ADC_LEVELS = 1024  # MCP3008 is a 10-bit ADC
+
+CALIBRATION_FILE = Path(__file__).parent / "calibration.json"
+
+REFERENCE_TEMPERATURE = 25.0
+
+
+def calibration_file(probe_name: str = "main") -> Path:
+    """
+    Calibration file for a probe: calibration.json for the main probe,
+    calibration.<probe>.json for the others of a multi-probe station.
+    """
+    if probe_name == "main":
+        return CALIBRATION_FILE
+    return CALIBRATION_FILE.with_name(f"calibration.{probe_name}.json")
+
+
+class CalibrationCurve:
+    """
+    Piecewise-linear raw ADC -> engineering unit curve.
+    
+    With no points the nominal sensor slope is used. One point shifts the
+    nominal line through it (an offset calibration). Two or more points
+    are joined linearly and extrapolated along the end segments.
+    """
+    
+    def __init__(self, units_per_adc: float, points: Optional[Sequence[Tuple[float, float]]] = None,
+                 scale: float = 1.0, offset: float = 0.0, decimals: int = 1):
+        """
+        Args:
+            units_per_adc: Nominal sensor slope (e.g. 1000 / 1023 ppm per count)
+            points: Calibration points as (raw_adc, known_value)
+            scale: Multiplier applied after the curve
+            offset: Constant added after scaling
+            decimals: Rounding of table entries
+        """
+        self.units_per_adc = units_per_adc
+        self.points: List[Tuple[float, float]] = sorted((float(r), float(v)) for r, v in (points or []))
+        self.scale = scale
+        self.offset = offset
+        self.decimals = decimals
+        self._base: Optional[array] = None
+        self._tables: Dict[int, array] = {}
+    
+    def add_point(self, raw: float, known_value: float):
+        """
+        Add a calibration point, replacing any existing point at the same raw value.
+        
+        Args:
+            raw: Averaged raw ADC reading of the reference solution
+            known_value: Its known value in output units (scale and offset
+                         are backed out so the table hits it exactly)
+        """
+        value = (known_value - self.offset) / self.scale
+        self.points = sorted([p for p in self.points if p[0] != raw] + [(float(raw), value)])
+        self.invalidate()
+    
+    def clear_points(self):
+        """Remove all calibration points (back to the nominal slope)."""
+        self.points = []
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop compiled tables after a parameter change."""
+        self._base = None
+        self._tables = {}
+    
+    def value_at(self, raw: float) -> float:
+        """Evaluate the curve (before scale, offset and rounding)."""
+        points = self.points
+        
+        if not points:
+            return raw * self.units_per_adc
+        
+        if len(points) == 1:
+            point_raw, point_value = points[0]
+            return point_value + (raw - point_raw) * self.units_per_adc
+        
+        # Find the segment containing raw (end segments extrapolate)
+        for i in range(1, len(points) - 1):
+            if raw < points[i][0]:
+                break
+        else:
+            i = len(points) - 1
+        
+        (x0, y0), (x1, y1) = points[i - 1], points[i]
+        if x1 == x0:
+            return y0
+        return y0 + (raw - x0) * (y1 - y0) / (x1 - x0)
+    
+    def _base_values(self) -> array:
+        """Unrounded, scaled and offset value for every ADC code."""
+        if self._base is None:
+            scale, offset = self.scale, self.offset
+            self._base = array('d', (self.value_at(raw) * scale + offset for raw in range(ADC_LEVELS)))
+        return self._base
+    
+    def table(self, key: Optional[int] = None, divisor: float = 1.0) -> array:
+        """
+        Get a compiled lookup table.
+        
+        Args:
+            key: Cache key for the divisor (e.g. a whole degree);
+                 None is the plain table
+            divisor: Every entry is divided by this before rounding
+        
+        Returns:
+            array('d') of ADC_LEVELS clamped, rounded values
+        """
+        table = self._tables.get(key)
+        if table is None:
+            decimals = self.decimals
+            table = array('d', (max(0, round(v / divisor, decimals)) for v in self._base_values()))
+            self._tables[key] = table
+        return table
+    
+    def to_dict(self) -> Dict:
+        """Serializable form for calibration.json."""
+        return {"points": [list(p) for p in self.points], "scale": self.scale, "offset": self.offset}
+
+
+class Calibration:
+    """
+    Calibration for all analog channels.
+    Loaded from calibration.json on hardware; identity in simulation.
+    """
+    
+    # Nominal conversion constants (calibrated for common sensors)
+    TDS_PPM_PER_ADC = 1000 / 1023  # 0-1000 ppm range
+    TURB_NTU_PER_ADC = 20 / 1023   # 0-20 NTU range
+    
+    def __init__(self, data: Optional[Dict] = None, path: Optional[Path] = None):
+        """
+        Args:
+            data: Parsed calibration.json contents (None for defaults)
+            path: File to save back to (None: never saved, as for the
+                  identity calibration of simulation or one from a trace)
+        """
+        data = data or {}
+        self.path = Path(path) if path else None
+        
+        self.tds = CalibrationCurve(
+            self.TDS_PPM_PER_ADC,
+            points=data.get("tds_points"),
+            scale=data.get("tds_scale", 1.0),
+            offset=data.get("tds_offset", 0),
+            decimals=1
+        )
+        self.turbidity = CalibrationCurve(
+            self.TURB_NTU_PER_ADC,
+            points=data.get("turbidity_points"),
+            scale=data.get("turbidity_scale", 1.0),
+            offset=data.get("turbidity_offset", data.get("turb_offset", 0)),
+            decimals=2
+        )
+        self.tds_temp_coefficient = data.get("tds_temp_coefficient", 0.0)
+        self.calibration_date = data.get("calibration_date")
+        self.notes = data.get("notes", "")
+    
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "Calibration":
+        """Load calibration from file, falling back to defaults."""
+        path = Path(path) if path else CALIBRATION_FILE
+        
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f), path=path)
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            print(f"⚠️  Error parsing calibration: {e}")
+        
+        return cls(path=path)
+    
+    @classmethod
+    def from_bytes(cls, raw: bytes, path: Optional[Path] = None) -> "Calibration":
+        """Rebuild a calibration serialized with to_bytes (e.g. from a trace)."""
+        return cls(json.loads(raw.decode('utf-8')), path=path)
+    
+    def to_bytes(self) -> bytes:
+        """Serialize in calibration.json form."""
+        return json.dumps(self.to_dict()).encode('utf-8')
+    
+    def save(self):
+        """Write calibration back to its file."""
+        if self.path is None:
+            print("⚠️  Calibration not saved - it is not backed by a file (simulation or replay)")
+            return
+        
+        self.calibration_date = datetime.now().isoformat(timespec="seconds")
+        
+        with open(self.path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+        print(f"💾 Calibration saved to {self.path}")
+    
+    def to_dict(self) -> Dict:
+        """Contents of calibration.json."""
+        tds = self.tds.to_dict()
+        turbidity = self.turbidity.to_dict()
+        
+        return {
+            "tds_offset": tds["offset"],
+            "tds_scale": tds["scale"],
+            "tds_points": tds["points"],
+            "tds_temp_coefficient": self.tds_temp_coefficient,
+            "turbidity_offset": turbidity["offset"],
+            "turbidity_scale": turbidity["scale"],
+            "turbidity_points": turbidity["points"],
+            "calibration_date": self.calibration_date,
+            "notes": self.notes
+        }
+    
+    def tds_table(self, temperature: Optional[float] = None) -> array:
+        """
+        Get the raw -> ppm table, temperature compensated if possible.
+        
+        Args:
+            temperature: Water temperature in Celsius (None = uncompensated)
+        """
+        if temperature is None or not self.tds_temp_coefficient:
+            return self.tds.table()
+        
+        degree = int(round(temperature))
+        divisor = 1 + self.tds_temp_coefficient * (degree - REFERENCE_TEMPERATURE)
+        if divisor <= 0:
+            return self.tds.table()
+        return self.tds.table(degree, divisor)
+    
+    def turbidity_table(self) -> array:
+        """Get the raw -> NTU table."""
+        return self.turbidity.table()
+    
+    def tds_ppm(self, raw: float, temperature: Optional[float] = None) -> float:
+        """Convert a raw TDS value (integer or filtered) to ppm."""
+        return lookup(self.tds_table(temperature), raw, self.tds.decimals)
+    
+    def turbidity_ntu(self, raw: float) -> float:
+        """Convert a raw Turbidity value (integer or filtered) to NTU."""
+        return lookup(self.turbidity_table(), raw, self.turbidity.decimals)
+    
+    def tds_ppm_burst(self, raws: Sequence[float], temperature: Optional[float] = None) -> List[float]:
+        """Convert a burst of raw TDS values to ppm."""
+        return lookup_burst(self.tds_table(temperature), raws, self.tds.decimals)
+    
+    def turbidity_ntu_burst(self, raws: Sequence[float]) -> List[float]:
+        """Convert a burst of raw Turbidity values to NTU."""
+        return lookup_burst(self.turbidity_table(), raws, self.turbidity.decimals)
+
+
+def lookup(table: array, raw: float, decimals: int) -> float:
+    """
+    Convert one raw value with a compiled table.
+    
+    Integer ADC codes are a direct index. Fractional values (from
+    oversampling filters) interpolate between neighbouring codes.
+    """
+    if raw.__class__ is int:
+        return table[raw]
+    
+    if raw <= 0:
+        return table[0]
+    if raw >= ADC_LEVELS - 1:
+        return table[ADC_LEVELS - 1]
+    
+    low = int(raw)
+    return round(table[low] + (table[low + 1] - table[low]) * (raw - low), decimals)
+
+
+def lookup_burst(table: array, raws: Sequence[float], decimals: int) -> List[float]:
+    """Convert a burst of raw values; raw ADC bursts are a single map over the table."""
+    if isinstance(raws, array) and raws.typecode == 'H':
+        return list(map(table.__getitem__, raws))
+    return [lookup(table, raw, decimals) for raw in raws]
@@ -0,0 +1,96 @@
+"""
+Aqua-Mind Clocks
+================
+Time source shared by the analysis pipeline.
+
+Components take an optional `clock` and use it for every sleep,
+deadline and timestamp. SystemClock is real time. VirtualClock only
+moves when something sleeps on it (or advance() is called), so
+simulated runs covering months - including seasonal changes - finish
+in seconds:
+
+    clock = VirtualClock(datetime(2025, 6, 1))
+    aqua = AquaMind(simulation_scenario="tap_water", clock=clock)
+
+Asyncio code awaits sleep_async() instead of calling sleep().
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SystemClock:
+    """
+    Real time: the time module and datetime.now().
+    """
+    
+    def monotonic(self) -> float:
+        """Seconds on a clock that never goes backwards."""
+        return time.monotonic()
+    
+    def time(self) -> float:
+        """Unix timestamp."""
+        return time.time()
+    
+    def now(self) -> datetime:
+        """Local wall-clock time."""
+        return datetime.now()
+    
+    def sleep(self, seconds: float):
+        """Block for the given number of seconds."""
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    async def sleep_async(self, seconds: float):
+        """Suspend the calling coroutine for the given number of seconds."""
+        await asyncio.sleep(max(0.0, seconds))
+
+
+class VirtualClock:
+    """
+    Simulated time that advances instantly.
+    sleep() moves the clock forward and returns immediately.
+    """
+    
+    def __init__(self, start: Optional[datetime] = None):
+        """
+        Args:
+            start: Wall-clock time at monotonic() == 0 (default: now)
+        """
+        self.start = start or datetime.now()
+        self._elapsed = 0.0
+        self._lock = threading.Lock()
+    
+    def monotonic(self) -> float:
+        """Seconds since the clock started."""
+        with self._lock:
+            return self._elapsed
+    
+    def time(self) -> float:
+        """Unix timestamp of the virtual time."""
+        return self.start.timestamp() + self.monotonic()
+    
+    def now(self) -> datetime:
+        """Virtual wall-clock time."""
+        return self.start + timedelta(seconds=self.monotonic())
+    
+    def sleep(self, seconds: float):
+        """Advance the clock instead of blocking."""
+        self.advance(seconds)
+    
+    async def sleep_async(self, seconds: float):
+        """Advance the clock, then yield once to the event loop."""
+        self.advance(seconds)
+        await asyncio.sleep(0)
+    
+    def advance(self, seconds: float):
+        """Move the clock forward (negative values are ignored)."""
+        if seconds > 0:
+            with self._lock:
+                self._elapsed += seconds
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,464 @@
+"""
+Aqua-Mind Fake Hardware
+=======================
+Software stand-ins for spidev, RPi.GPIO and the 1-Wire sysfs tree, so the
+real HardwareSensors driver can run (and be profiled) on any machine.
+
+The fakes speak the same byte-level protocols as the hardware:
+- MCP3008: commands are decoded bit by bit from each SPI transfer, and
+  chip select must be released between conversions (cs_change), both
+  for xfer2 and for batched SPI_IOC_MESSAGE ioctls.
+- DS18B20: w1_slave files are written with real scratchpad bytes and CRC.
+- GPIO: pins must be set up before use, like RPi.GPIO.
+
+Signals are driven by waveforms: a constant, a sequence (one value per
+read, repeating) or a function of time in seconds since the backend
+started.
+
+Usage:
+    hw = FakeHardware(adc={0: sine(400, 20, 5.0), 1: 60}, temperatures={"28-0001": 24.5})
+    sensors = SensorManager(backend=hw)
+"""
+
+import ctypes
+import math
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+Waveform = Union[float, Sequence[float], Callable[[float], float]]
+
+
+def sine(mean: float, amplitude: float, period: float) -> Callable[[float], float]:
+    """Sine wave around mean with the given amplitude and period (seconds)."""
+    return lambda t: mean + amplitude * math.sin(2 * math.pi * t / period)
+
+
+def noisy(base: Waveform, sigma: float, seed: Optional[int] = None) -> Callable[[float], float]:
+    """Add Gaussian noise to a waveform."""
+    rng = random.Random(seed)
+    source = WaveformSource(base)
+    return lambda t: source.value(t) + rng.gauss(0, sigma)
+
+
+def steps(*levels: float, duration: float = 1.0) -> Callable[[float], float]:
+    """Hold each level for `duration` seconds, then repeat."""
+    return lambda t: levels[int(t / duration) % len(levels)]
+
+
+class WaveformSource:
+    """
+    Evaluates a waveform. Sequences advance one value per read.
+    """
+    
+    def __init__(self, waveform: Waveform):
+        self.waveform = waveform
+        self._position = 0
+    
+    def value(self, t: float) -> float:
+        """Value at time t (seconds since the backend started)."""
+        waveform = self.waveform
+        if callable(waveform):
+            return waveform(t)
+        if isinstance(waveform, (int, float)):
+            return waveform
+        
+        value = waveform[self._position % len(waveform)]
+        self._position += 1
+        return value
+
+
+class FakeMCP3008:
+    """
+    Bit-level model of an MCP3008 on one chip select.
+    
+    After chip select falls, the first 1 bit clocked in is the start bit,
+    followed by SGL/DIFF and D2-D0. The chip then samples for one clock,
+    outputs a null bit and B9..B0 MSB first. Bits outside that window
+    read as 0.
+    """
+    
+    VREF_COUNTS = 1023
+    
+    def __init__(self, channels: Optional[Dict[int, Waveform]] = None, clock: Callable[[], float] = None):
+        """
+        Args:
+            channels: Channel (0-7) -> waveform in raw ADC counts
+            clock: Returns seconds since the backend started
+        """
+        self.clock = clock or time.monotonic
+        self.channels = {ch: WaveformSource(w) for ch, w in (channels or {}).items()}
+        self.conversions = 0
+    
+    def set_channel(self, channel: int, waveform: Waveform):
+        """Drive an input channel."""
+        self.channels[channel] = WaveformSource(waveform)
+    
+    def sample(self, channel: int) -> int:
+        """Current 10-bit code of a single-ended channel."""
+        source = self.channels.get(channel)
+        if source is None:
+            return 0
+        return max(0, min(self.VREF_COUNTS, int(round(source.value(self.clock())))))
+    
+    def transfer(self, tx: bytes, new_conversion: bool = True) -> bytes:
+        """
+        Clock one chip-select-low period of bytes through the chip.
+        
+        Args:
+            tx: Bytes clocked in on MOSI
+            new_conversion: False if chip select was held from the previous
+                            transfer (no falling edge, so no new command)
+        
+        Returns:
+            Bytes clocked out on MISO
+        """
+        rx = bytearray(len(tx))
+        if not new_conversion:
+            return bytes(rx)
+        
+        bits = [(byte >> (7 - i)) & 1 for byte in tx for i in range(8)]
+        try:
+            start = bits.index(1)
+        except ValueError:
+            return bytes(rx)
+        if start + 4 >= len(bits):
+            return bytes(rx)
+        
+        single_ended = bits[start + 1]
+        channel = (bits[start + 2] << 2) | (bits[start + 3] << 1) | bits[start + 4]
+        if single_ended:
+            value = self.sample(channel)
+        else:
+            # Pseudo-differential: IN+ is the channel, IN- its pair partner
+            value = max(0, self.sample(channel) - self.sample(channel ^ 1))
+        self.conversions += 1
+        
+        # Null bit at start + 6, then B9..B0
+        for k in range(10):
+            pos = start + 7 + k
+            if pos < len(bits) and (value >> (9 - k)) & 1:
+                rx[pos // 8] |= 0x80 >> (pos % 8)
+        return bytes(rx)
+
+
+class FakeSpiDev:
+    """
+    spidev.SpiDev stand-in wired to a FakeHardware backend.
+    """
+    
+    def __init__(self, hardware: "FakeHardware"):
+        self._hardware = hardware
+        self.bus = None
+        self.device = None
+        self.max_speed_hz = 500000
+        self.mode = 0
+        self.bits_per_word = 8
+        self._fd = None
+    
+    def open(self, bus: int, device: int):
+        """Open /dev/spidev<bus>.<device>."""
+        if (bus, device) not in self._hardware.chips:
+            raise FileNotFoundError(f"No such device: /dev/spidev{bus}.{device}")
+        self.bus, self.device = bus, device
+        self._fd = self._hardware._register_fd(self)
+    
+    @property
+    def chip(self) -> FakeMCP3008:
+        if self._fd is None:
+            raise OSError("SpiDev is not open")
+        return self._hardware.chips[(self.bus, self.device)]
+    
+    def fileno(self) -> int:
+        """File descriptor for ioctl (see FakeHardware.ioctl)."""
+        if self._fd is None:
+            raise OSError("SpiDev is not open")
+        return self._fd
+    
+    def xfer2(self, data: List[int]) -> List[int]:
+        """Transfer a list of bytes with chip select held for the whole list."""
+        self._hardware.transfers += 1
+        return list(self.chip.transfer(bytes(data)))
+    
+    xfer = xfer2
+    
+    def close(self):
+        self._hardware._release_fd(self._fd)
+        self._fd = None
+
+
+class FakeGPIO:
+    """
+    RPi.GPIO stand-in. Input pins follow a waveform of 0/1 levels;
+    undriven inputs follow their pull resistor.
+    """
+    
+    BCM = 11
+    BOARD = 10
+    IN = 1
+    OUT = 0
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    
+    def __init__(self, clock: Callable[[], float] = None):
+        self.clock = clock or time.monotonic
+        self.mode = None
+        self.pins: Dict[int, Dict] = {}
+        self._inputs: Dict[int, WaveformSource] = {}
+    
+    def drive(self, pin: int, waveform: Waveform):
+        """Drive an input pin with a waveform of 0/1 levels."""
+        self._inputs[pin] = WaveformSource(waveform)
+    
+    def setmode(self, mode: int):
+        self.mode = mode
+    
+    def setup(self, pin: int, direction: int, pull_up_down: int = PUD_OFF, initial: int = LOW):
+        if self.mode is None:
+            raise RuntimeError("Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or GPIO.setmode(GPIO.BCM)")
+        self.pins[pin] = {"direction": direction, "pull": pull_up_down, "level": initial}
+    
+    def input(self, pin: int) -> int:
+        config = self.pins.get(pin)
+        if config is None:
+            raise RuntimeError("You must setup() the GPIO channel first")
+        
+        if config["direction"] == self.OUT:
+            return config["level"]
+        source = self._inputs.get(pin)
+        if source is not None:
+            return self.HIGH if source.value(self.clock()) else self.LOW
+        return self.HIGH if config["pull"] == self.PUD_UP else self.LOW
+    
+    def output(self, pin: int, level: int):
+        config = self.pins.get(pin)
+        if config is None or config["direction"] != self.OUT:
+            raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+        config["level"] = self.HIGH if level else self.LOW
+    
+    def cleanup(self):
+        self.pins = {}
+        self.mode = None
+
+
+def ds18b20_crc8(data: bytes) -> int:
+    """Dallas/Maxim 1-Wire CRC-8 (polynomial x^8 + x^5 + x^4 + 1)."""
+    crc = 0
+    for byte in data:
+        for _ in range(8):
+            mix = (crc ^ byte) & 1
+            crc >>= 1
+            if mix:
+                crc ^= 0x8C
+            byte >>= 1
+    return crc
+
+
+def w1_slave_contents(temperature: float, crc_error: bool = False) -> str:
+    """
+    Render a DS18B20 w1_slave file for a temperature.
+    
+    Args:
+        temperature: Celsius (12-bit resolution, 1/16 degree)
+        crc_error: Corrupt the CRC so the kernel reports NO
+    """
+    raw = max(-880, min(2000, int(round(temperature * 16))))
+    scratchpad = struct.pack("<hBBBBBB", raw, 0x4B, 0x46, 0x7F, 0xFF, 0x0C, 0x10)
+    crc = ds18b20_crc8(scratchpad)
+    if crc_error:
+        crc ^= 0xFF
+    
+    data = " ".join(f"{b:02x}" for b in scratchpad + bytes([crc]))
+    status = "NO" if crc_error else "YES"
+    return f"{data} : crc={crc:02x} {status}\n{data} t={raw * 1000 // 16}\n"
+
+
+class FakeOneWire:
+    """
+    A 1-Wire sysfs devices directory with DS18B20 sensors.
+    Files are rewritten on refresh(), like a completed conversion.
+    """
+    
+    def __init__(self, sensors: Optional[Dict[str, Waveform]] = None, base_dir: Optional[str] = None,
+                 clock: Callable[[], float] = None):
+        """
+        Args:
+            sensors: Device ID (e.g. "28-0316a2794aff") -> waveform in Celsius
+            base_dir: Directory to create the tree in (default: a temp dir)
+            clock: Returns seconds since the backend started
+        """
+        self.clock = clock or time.monotonic
+        self.base_dir = base_dir or tempfile.mkdtemp(prefix="aquamind-w1-")
+        self.sensors = {device: WaveformSource(w) for device, w in (sensors or {}).items()}
+        self.crc_errors = set()
+        self.refresh()
+    
+    def set_crc_error(self, device_id: str, error: bool = True):
+        """Make a sensor report CRC failures (e.g. a long, noisy cable)."""
+        if error:
+            self.crc_errors.add(device_id)
+        else:
+            self.crc_errors.discard(device_id)
+        self.refresh()
+    
+    def refresh(self):
+        """Write every sensor's current reading."""
+        t = self.clock()
+        for device_id, source in self.sensors.items():
+            device_dir = os.path.join(self.base_dir, device_id)
+            os.makedirs(device_dir, exist_ok=True)
+            contents = w1_slave_contents(source.value(t), device_id in self.crc_errors)
+            
+            # Replace atomically so readers never see a partial file
+            tmp_path = os.path.join(device_dir, "w1_slave.tmp")
+            with open(tmp_path, "w") as f:
+                f.write(contents)
+            os.replace(tmp_path, os.path.join(device_dir, "w1_slave"))
+
+
+class FakeHardware:
+    """
+    A complete fake Raspberry Pi backend for HardwareSensors
+    (duck-types sensors.HardwareBackend).
+    """
+    
+    # spi_ioc_transfer: tx_buf, rx_buf, len, speed_hz, delay_usecs,
+    # bits_per_word, cs_change, tx_nbits, rx_nbits, word_delay_usecs, pad
+    _SPI_IOC_TRANSFER = struct.Struct("=QQIIHBBBBBB")
+    _SPI_IOC_MAGIC = ord('k')
+    # fcntl.ioctl copies immutable arguments into a buffer of this size
+    _IOCTL_IMMUTABLE_MAX = 1024
+    
+    def __init__(self, adc: Optional[Dict[int, Waveform]] = None,
+                 temperatures: Optional[Dict[str, Waveform]] = None,
+                 chips: Optional[Dict[tuple, Dict[int, Waveform]]] = None,
+                 button: Optional[Waveform] = None, w1_refresh: float = 0.5):
+        """
+        Args:
+            adc: Waveforms for the MCP3008 on SPI0 CE0 (channel -> raw counts)
+            temperatures: DS18B20 device ID -> waveform in Celsius
+            chips: Extra MCP3008s as (bus, device) -> channel waveforms
+            button: Level waveform for the calibration button (GPIO 17);
+                    default is released (pulled up)
+            w1_refresh: Seconds between DS18B20 file updates (0 = only on refresh())
+        """
+        self._start = time.monotonic()
+        
+        self.chips = {(0, 0): FakeMCP3008(adc, clock=self.elapsed)}
+        for key, channels in (chips or {}).items():
+            self.chips[key] = FakeMCP3008(channels, clock=self.elapsed)
+        
+        self.GPIO = FakeGPIO(clock=self.elapsed)
+        if button is not None:
+            self.GPIO.drive(17, button)
+        
+        self.one_wire = FakeOneWire(temperatures, clock=self.elapsed)
+        self.w1_devices_dir = self.one_wire.base_dir
+        
+        self.spidev = self  # Provides SpiDev()
+        self.transfers = 0
+        self.ioctls = 0
+        self._fds: Dict[int, FakeSpiDev] = {}
+        self._next_fd = 1000
+        
+        self._stop = threading.Event()
+        self._refresher = None
+        if w1_refresh and temperatures:
+            self._refresher = threading.Thread(target=self._refresh_loop, args=(w1_refresh,), daemon=True)
+            self._refresher.start()
+    
+    def elapsed(self) -> float:
+        """Seconds since the backend started (the waveform time base)."""
+        return time.monotonic() - self._start
+    
+    def SpiDev(self) -> FakeSpiDev:
+        """spidev.SpiDev() factory."""
+        return FakeSpiDev(self)
+    
+    def ioctl(self, fd: int, request: int, arg: Union[bytes, bytearray]) -> int:
+        """
+        fcntl.ioctl stand-in for SPI_IOC_MESSAGE(n).
+        
+        The spi_ioc_transfer array is unpacked and every transfer reads its
+        tx buffer and writes its rx buffer through the addresses it
+        contains, exactly as the kernel would. Like fcntl, an immutable
+        argument over 1024 bytes is rejected with ValueError.
+        """
+        view = memoryview(arg)
+        if view.readonly and view.nbytes > self._IOCTL_IMMUTABLE_MAX:
+            raise ValueError("ioctl string arg too long")
+        
+        spi = self._fds.get(fd)
+        if spi is None:
+            raise OSError(9, "Bad file descriptor")
+        
+        size = (request >> 16) & 0x3FFF
+        direction = request >> 30
+        if (request >> 8) & 0xFF != self._SPI_IOC_MAGIC or request & 0xFF != 0 or direction != 1:
+            raise OSError(25, "Inappropriate ioctl for device")
+        if size != len(arg) or size % self._SPI_IOC_TRANSFER.size:
+            raise OSError(22, "Invalid argument")
+        
+        self.ioctls += 1
+        chip = spi.chip
+        new_conversion = True
+        total = 0
+        for fields in self._SPI_IOC_TRANSFER.iter_unpack(arg):
+            tx_buf, rx_buf, length, _speed, _delay, _bits, cs_change = fields[:7]
+            tx = ctypes.string_at(tx_buf, length) if tx_buf else bytes(length)
+            rx = chip.transfer(tx, new_conversion)
+            if rx_buf:
+                ctypes.memmove(rx_buf, rx, length)
+            # Chip select is released after a transfer only if cs_change is set
+            new_conversion = bool(cs_change)
+            total += length
+        
+        self.transfers += 1
+        return total
+    
+    def _register_fd(self, spi: FakeSpiDev) -> int:
+        fd = self._next_fd
+        self._next_fd += 1
+        self._fds[fd] = spi
+        return fd
+    
+    def _release_fd(self, fd: Optional[int]):
+        self._fds.pop(fd, None)
+    
+    def _refresh_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.one_wire.refresh()
+    
+    def close(self):
+        """Stop the 1-Wire refresher."""
+        self._stop.set()
+        if self._refresher:
+            self._refresher.join(timeout=2)
+            self._refresher = None
+
+
+# Quick test when run directly
+if __name__ == "__main__":
+    from sensors import SensorManager
+    
+    hw = FakeHardware(adc={0: noisy(400, 3, seed=1), 1: sine(50, 5, 2.0)},
+                      temperatures={"28-0316a2794aff": 24.5})
+    sensors = SensorManager(backend=hw)
+    
+    start = time.perf_counter()
+    burst = sensors._driver.read_burst(0, 1000)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Snapshot: {sensors.snapshot()}")
+    print(f"Burst: 1000 samples in {elapsed * 1000:.1f} ms, "
+          f"mean {sum(burst) / len(burst):.1f}, {hw.ioctls} ioctls")
+    
+    sensors.cleanup()
+    hw.close()
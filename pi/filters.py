@@ -0,0 +1,153 @@
+"""
+Aqua-Mind Sample Filters
+========================
+Per-channel noise filters that run on blocks of raw ADC samples,
+between the sensor driver and unit conversion.
+
+Each stage takes a whole block and returns a new block, so the MCP3008
+can be oversampled in one burst read and reduced to a cleaner value:
+
+    FilterChain(MedianFilter(3), Decimator(16))   # spike rejection + 2 extra bits
+
+Stages report how many input samples they need per output sample
+(input_length), which lets the chain size its burst reads.
+"""
+
+import math
+from itertools import accumulate
+from statistics import median
+from typing import Dict, List, Sequence
+
+
+class MedianFilter:
+    """
+    Median-of-k: one output per group of k samples.
+    Rejects single-sample spikes (e.g. bubbles on the turbidity window).
+    """
+    
+    def __init__(self, k: int = 3):
+        self.k = k
+    
+    def input_length(self, n: int) -> int:
+        """Samples needed for n outputs."""
+        return n * self.k
+    
+    def process(self, block: Sequence[float]) -> List[float]:
+        """Median of each group of k samples."""
+        k = self.k
+        return [median(block[i:i + k]) for i in range(0, len(block) - k + 1, k)]
+
+
+class MovingAverage:
+    """
+    Sliding mean over n samples.
+    Output starts once the window is full; shorter blocks give their mean.
+    """
+    
+    def __init__(self, n: int = 8):
+        self.n = n
+    
+    def input_length(self, n: int) -> int:
+        """Samples needed for n outputs."""
+        return n + self.n - 1
+    
+    def process(self, block: Sequence[float]) -> List[float]:
+        """Mean of every full window of n samples."""
+        n = self.n
+        if len(block) < n:
+            return [sum(block) / len(block)] if len(block) else []
+        
+        sums = list(accumulate(block, initial=0))
+        return [(sums[i + n] - sums[i]) / n for i in range(len(block) - n + 1)]
+
+
+class IIRFilter:
+    """
+    Single-pole low-pass: y += alpha * (x - y), seeded with the first sample.
+    Smaller alpha smooths more.
+    
+    The filter keeps no state between blocks, so each block starts with a
+    settling run of SETTLING_TIME_CONSTANTS time constants (~1/alpha
+    samples each) that leaves the seed sample under 1% of the output.
+    """
+    
+    SETTLING_TIME_CONSTANTS = 5
+    
+    def __init__(self, alpha: float = 0.25):
+        self.alpha = alpha
+    
+    def input_length(self, n: int) -> int:
+        """Samples needed for n settled outputs."""
+        return n + math.ceil(self.SETTLING_TIME_CONSTANTS / self.alpha)
+    
+    def process(self, block: Sequence[float]) -> List[float]:
+        """Filtered value after each sample."""
+        alpha = self.alpha
+        return list(accumulate(block, lambda y, x: y + alpha * (x - y)))
+
+
+class Decimator:
+    """
+    Oversample-and-decimate: average each group of `factor` samples.
+    Averaging 4^n samples of noisy input adds n bits of resolution, so the
+    output is in raw ADC counts with a fractional part.
+    """
+    
+    def __init__(self, factor: int = 16):
+        self.factor = factor
+    
+    def input_length(self, n: int) -> int:
+        """Samples needed for n outputs."""
+        return n * self.factor
+    
+    def process(self, block: Sequence[float]) -> List[float]:
+        """Mean of each group of `factor` samples."""
+        f = self.factor
+        return [sum(block[i:i + f]) / f for i in range(0, len(block) - f + 1, f)]
+
+
+class FilterChain:
+    """
+    A sequence of filter stages applied in order.
+    """
+    
+    STAGES = {
+        "median": (MedianFilter, "k"),
+        "moving_average": (MovingAverage, "n"),
+        "iir": (IIRFilter, "alpha"),
+        "decimate": (Decimator, "factor")
+    }
+    
+    def __init__(self, *stages):
+        self.stages = stages
+    
+    @classmethod
+    def from_config(cls, config: Sequence[Dict]) -> "FilterChain":
+        """
+        Build a chain from JSON-style config.
+        
+        Args:
+            config: e.g. [{"type": "median", "k": 3}, {"type": "decimate", "factor": 16}]
+        
+        Raises:
+            ValueError: If a stage type is unknown
+        """
+        stages = []
+        for stage in config:
+            if stage.get("type") not in cls.STAGES:
+                raise ValueError(f"Unknown filter type: {stage.get('type')}")
+            stage_cls, param = cls.STAGES[stage["type"]]
+            stages.append(stage_cls(stage[param]) if param in stage else stage_cls())
+        return cls(*stages)
+    
+    def input_length(self, n: int = 1) -> int:
+        """Raw samples needed to produce n filtered outputs."""
+        for stage in reversed(self.stages):
+            n = stage.input_length(n)
+        return n
+    
+    def process(self, block: Sequence[float]) -> List[float]:
+        """Run a block of raw samples through every stage."""
+        for stage in self.stages:
+            block = stage.process(block)
+        return block
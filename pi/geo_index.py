@@ -0,0 +1,194 @@
+"""
+Aqua-Mind Geo Index
+===================
+Offline nearest-profile lookup from GPS coordinates.
+
+Profile locations are projected onto the unit sphere (x, y, z) and kept
+in a balanced k-d tree stored implicitly in flat arrays: the node for
+positions [lo, hi) is the median at (lo + hi) // 2, split on the axis
+with the largest spread. Straight-line (chord) distance on the sphere
+orders points exactly like great-circle distance, so a nearest lookup
+descends O(log n) nodes with no trigonometry beyond projecting the query.
+
+Each node also records its subtree's bounding box and largest radius.
+A subtree is skipped when its box is farther than the best match so far,
+or farther than any of its points reaches - so a position outside every
+village's radius is rejected without visiting them all.
+"""
+
+import math
+from array import array
+from typing import Dict, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Project degrees latitude/longitude onto the unit sphere."""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    cos_phi = math.cos(phi)
+    return cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)
+
+
+def chord_to_km(chord: float) -> float:
+    """Great-circle distance for a chord length on the unit sphere."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km: float) -> float:
+    """Chord length on the unit sphere for a great-circle distance."""
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def validate_location(location) -> Tuple[float, float, float]:
+    """
+    Check a profile's "location" entry.
+    
+    Args:
+        location: {"lat": degrees, "lon": degrees, "radius_km": optional}
+    
+    Returns:
+        (lat, lon, radius_km), radius_km being inf when not limited
+    
+    Raises:
+        ValueError: If the location is invalid
+    """
+    if not isinstance(location, dict):
+        raise ValueError("location must be an object")
+    
+    values = []
+    for key, low, high in (("lat", -90, 90), ("lon", -180, 180), ("radius_km", 0, math.inf)):
+        value = location.get(key, math.inf if key == "radius_km" else None)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+            raise ValueError(f"location.{key} must be a number in [{low}, {high}]")
+        values.append(float(value))
+    return tuple(values)
+
+
+class GeoIndex:
+    """
+    Nearest-location lookup over named points, each optionally limited
+    to a radius (a village profile shouldn't apply 200 km away).
+    """
+    
+    def __init__(self, locations: Dict[str, Tuple[float, float, float]]):
+        """
+        Args:
+            locations: name -> (lat, lon, radius_km)
+        """
+        self.names = list(locations)
+        n = len(self.names)
+        self.coords = [array('d', [0.0]) * n for _ in range(3)]
+        self.reach = array('d', [0.0]) * n  # Chord length each point applies within
+        
+        for i, (lat, lon, radius_km) in enumerate(locations.values()):
+            for axis, value in enumerate(to_unit_vector(lat, lon)):
+                self.coords[axis][i] = value
+            self.reach[i] = km_to_chord(radius_km) if radius_km != math.inf else math.inf
+        
+        # Per node position: point index, split axis, and the subtree's
+        # largest reach and bounding box (per-axis min and max)
+        self.order = array('l', range(n))
+        self.split = array('b', [0]) * n
+        self.subtree_reach = array('d', [0.0]) * n
+        self.box_min = [array('d', [0.0]) * n for _ in range(3)]
+        self.box_max = [array('d', [0.0]) * n for _ in range(3)]
+        self._build(0, n)
+    
+    def _build(self, lo: int, hi: int):
+        """Arrange order[lo:hi] as a subtree rooted at its median."""
+        stack = [(lo, hi)]
+        coords = self.coords
+        nodes = []  # (lo, hi) of every node, parents before children
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= 0:
+                continue
+            nodes.append((lo, hi))
+            
+            points = self.order[lo:hi]
+            spreads = []
+            for column in coords:
+                values = [column[i] for i in points]
+                spreads.append(max(values) - min(values))
+            axis = spreads.index(max(spreads))
+            
+            self.order[lo:hi] = array('l', sorted(points, key=coords[axis].__getitem__))
+            mid = (lo + hi) // 2
+            self.split[mid] = axis
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+        
+        # Children first: a node covers its own point and both subtrees
+        reach, subtree_reach = self.reach, self.subtree_reach
+        for lo, hi in reversed(nodes):
+            mid = (lo + hi) // 2
+            i = self.order[mid]
+            children = [(child_lo + child_hi) // 2
+                        for child_lo, child_hi in ((lo, mid), (mid + 1, hi)) if child_lo < child_hi]
+            
+            subtree_reach[mid] = max([reach[i]] + [subtree_reach[c] for c in children])
+            for axis in range(3):
+                low, high = self.box_min[axis], self.box_max[axis]
+                value = coords[axis][i]
+                low[mid] = min([value] + [low[c] for c in children])
+                high[mid] = max([value] + [high[c] for c in children])
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def nearest(self, lat: float, lon: float) -> Optional[Tuple[str, float]]:
+        """
+        Find the closest point whose radius covers the position.
+        
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+        
+        Returns:
+            Tuple of (name, distance in km), or None if no point applies
+        """
+        qx, qy, qz = to_unit_vector(lat, lon)
+        xs, ys, zs = self.coords
+        order, reach, subtree_reach = self.order, self.reach, self.subtree_reach
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = self.box_min, self.box_max
+        
+        def box_distance(node: int) -> float:
+            """Squared distance from the query to a subtree's bounding box."""
+            dx = min_x[node] - qx if qx < min_x[node] else (qx - max_x[node] if qx > max_x[node] else 0.0)
+            dy = min_y[node] - qy if qy < min_y[node] else (qy - max_y[node] if qy > max_y[node] else 0.0)
+            dz = min_z[node] - qz if qz < min_z[node] else (qz - max_z[node] if qz > max_z[node] else 0.0)
+            return dx * dx + dy * dy + dz * dz
+        
+        best, best_d2 = -1, math.inf
+        stack = []  # (lo, hi, squared distance to the subtree's box)
+        if order:
+            stack.append((0, len(order), box_distance(len(order) // 2)))
+        while stack:
+            lo, hi, bound = stack.pop()
+            mid = (lo + hi) // 2
+            max_reach = subtree_reach[mid]
+            if bound >= best_d2 or bound > max_reach * max_reach:
+                continue  # Nothing in this subtree is closer, or reaches the position
+            
+            i = order[mid]
+            dx = xs[i] - qx
+            dy = ys[i] - qy
+            dz = zs[i] - qz
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 < best_d2 and d2 <= reach[i] * reach[i]:
+                best, best_d2 = i, d2
+            
+            # Push the farther child first so the nearer one is searched next
+            children = []
+            for child_lo, child_hi in ((lo, mid), (mid + 1, hi)):
+                if child_lo < child_hi:
+                    child = (child_lo + child_hi) // 2
+                    children.append((child_lo, child_hi, box_distance(child)))
+            children.sort(key=lambda child: child[2], reverse=True)
+            stack.extend(children)
+        
+        if best < 0:
+            return None
+        return self.names[best], chord_to_km(math.sqrt(best_d2))
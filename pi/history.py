@@ -0,0 +1,230 @@
+"""
+Aqua-Mind Rollup History
+========================
+Bounded-memory long-term history of analysis readings.
+
+Every reading is folded into per-sensor buckets at three resolutions:
+
+    1 minute  x 1440  (last day)
+    1 hour    x 720   (last 30 days)
+    1 day     x 366   (last year)
+
+Each bucket keeps count, mean, variance (Welford M2), min and max in
+preallocated arrays, so an update is O(1), a query over any span reads at
+most a few hundred buckets, and memory never grows (~350 KB for three
+sensors).
+
+Buckets are aligned to local time (by default the system's UTC offset),
+so a daily point covers a calendar day - midnight to midnight in India,
+not 05:30 to 05:30.
+"""
+
+import math
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from clock import SYSTEM_CLOCK
+
+# (bucket seconds, number of buckets kept)
+DEFAULT_RESOLUTIONS = (
+    (60, 1440),
+    (3600, 720),
+    (86400, 366)
+)
+
+
+class RollupLevel:
+    """
+    One resolution: a ring of fixed-width time buckets.
+    Slot i holds the bucket whose index ((timestamp + offset) // width)
+    maps to it; stale slots are reset when their index comes round again.
+    """
+    
+    def __init__(self, width: int, capacity: int, offset: float = 0.0):
+        """
+        Args:
+            width: Bucket width in seconds
+            capacity: Number of buckets kept
+            offset: Seconds added to timestamps before bucketing (the UTC
+                    offset, so buckets start at local midnight/hours)
+        """
+        self.width = width
+        self.capacity = capacity
+        self.offset = offset
+        self.bucket = array('q', [-1]) * capacity  # Bucket index held by each slot
+        self.count = array('L', [0]) * capacity
+        self.mean = array('d', [0.0]) * capacity
+        self.m2 = array('d', [0.0]) * capacity
+        self.min = array('d', [0.0]) * capacity
+        self.max = array('d', [0.0]) * capacity
+    
+    def add(self, timestamp: float, value: float):
+        """Fold a reading into its bucket."""
+        index = int((timestamp + self.offset) // self.width)
+        slot = index % self.capacity
+        
+        if self.bucket[slot] != index:
+            self.bucket[slot] = index
+            self.count[slot] = 1
+            self.mean[slot] = value
+            self.m2[slot] = 0.0
+            self.min[slot] = value
+            self.max[slot] = value
+            return
+        
+        n = self.count[slot] + 1
+        delta = value - self.mean[slot]
+        self.count[slot] = n
+        self.mean[slot] += delta / n
+        self.m2[slot] += delta * (value - self.mean[slot])
+        if value < self.min[slot]:
+            self.min[slot] = value
+        if value > self.max[slot]:
+            self.max[slot] = value
+    
+    def slots(self, start: float, end: float) -> List[int]:
+        """Slots holding buckets that overlap [start, end], oldest first."""
+        first = int((start + self.offset) // self.width)
+        last = int((end + self.offset) // self.width)
+        first = max(first, last - self.capacity + 1)
+        
+        bucket = self.bucket
+        capacity = self.capacity
+        return [i % capacity for i in range(first, last + 1) if bucket[i % capacity] == i]
+    
+    def stats(self, slot: int) -> Dict:
+        """Summary of one bucket."""
+        n = self.count[slot]
+        return {
+            "start": self.bucket[slot] * self.width - self.offset,
+            "count": n,
+            "mean": self.mean[slot],
+            "min": self.min[slot],
+            "max": self.max[slot],
+            "variance": self.m2[slot] / (n - 1) if n > 1 else 0.0
+        }
+
+
+class RollupHistory:
+    """
+    Multi-resolution history for a set of sensors.
+    """
+    
+    SENSORS = ("tds", "turbidity", "temperature")
+    
+    def __init__(self, sensors: Sequence[str] = SENSORS,
+                 resolutions: Sequence[Tuple[int, int]] = DEFAULT_RESOLUTIONS, clock=None,
+                 utc_offset: Optional[float] = None):
+        """
+        Args:
+            sensors: Sensor names to track
+            resolutions: (bucket seconds, buckets kept), finest first
+            clock: Time source for bucket timestamps (default: SYSTEM_CLOCK)
+            utc_offset: Deployment's offset from UTC in seconds, e.g. 19800
+                        for IST (default: the system's current offset)
+        """
+        self.clock = clock or SYSTEM_CLOCK
+        if utc_offset is None:
+            utc_offset = datetime.now().astimezone().utcoffset().total_seconds()
+        self.utc_offset = utc_offset
+        self.resolutions = tuple(sorted(resolutions))
+        self.levels: Dict[str, List[RollupLevel]] = {
+            sensor: [RollupLevel(width, capacity, utc_offset) for width, capacity in self.resolutions]
+            for sensor in sensors
+        }
+    
+    def add_reading(self, sensor: str, value: float, timestamp: Optional[float] = None):
+        """
+        Record a reading at every resolution.
+        
+        Args:
+            sensor: Sensor name (unknown sensors are ignored)
+            value: Reading
+            timestamp: Unix time (default: now on the clock)
+        """
+        levels = self.levels.get(sensor)
+        if levels is None:
+            return
+        if timestamp is None:
+            timestamp = self.clock.time()
+        for level in levels:
+            level.add(timestamp, value)
+    
+    def add_readings(self, readings: Dict[str, float], timestamp: Optional[float] = None):
+        """Record several sensors' readings at the same time."""
+        if timestamp is None:
+            timestamp = self.clock.time()
+        for sensor, value in readings.items():
+            self.add_reading(sensor, value, timestamp)
+    
+    def _level_for(self, sensor: str, seconds: float, resolution: Optional[int]) -> RollupLevel:
+        """Pick the requested resolution, or the finest one that covers the span."""
+        levels = self.levels[sensor]
+        if resolution is not None:
+            for level in levels:
+                if level.width == resolution:
+                    return level
+            raise ValueError(f"No {resolution}s resolution (have {[w for w, _ in self.resolutions]})")
+        
+        for level in levels:
+            if level.width * level.capacity >= seconds:
+                return level
+        return levels[-1]
+    
+    def summary(self, sensor: str, seconds: float, resolution: Optional[int] = None) -> Optional[Dict]:
+        """
+        Combined statistics over the last `seconds`.
+        
+        Buckets are merged with the parallel variance formula, so the result
+        matches computing over the raw readings (at bucket granularity).
+        
+        Args:
+            sensor: Sensor name
+            seconds: Span to summarize, ending now
+            resolution: Bucket width to use (default: finest that covers the span)
+        
+        Returns:
+            Dict with count, mean, min, max and variance, or None without data
+        """
+        if sensor not in self.levels:
+            return None
+        
+        now = self.clock.time()
+        level = self._level_for(sensor, seconds, resolution)
+        
+        count, mean, m2 = 0, 0.0, 0.0
+        low, high = math.inf, -math.inf
+        for slot in level.slots(now - seconds, now):
+            n_b = level.count[slot]
+            delta = level.mean[slot] - mean
+            total = count + n_b
+            mean += delta * n_b / total
+            m2 += level.m2[slot] + delta * delta * count * n_b / total
+            count = total
+            low = min(low, level.min[slot])
+            high = max(high, level.max[slot])
+        
+        if count == 0:
+            return None
+        
+        return {
+            "count": count,
+            "mean": round(mean, 3),
+            "min": low,
+            "max": high,
+            "variance": round(m2 / (count - 1), 4) if count > 1 else 0.0,
+            "resolution_s": level.width
+        }
+    
+    def series(self, sensor: str, seconds: float, resolution: Optional[int] = None) -> List[Dict]:
+        """
+        Per-bucket statistics over the last `seconds`, oldest first
+        (e.g. hourly points for a week-long chart).
+        """
+        if sensor not in self.levels:
+            return []
+        
+        now = self.clock.time()
+        level = self._level_for(sensor, seconds, resolution)
+        return [level.stats(slot) for slot in level.slots(now - seconds, now)]
@@ -12,17 +12,69 @@ Usage:
 
 import argparse
 import json
-import time
+import queue
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
 # Import our modules
+from clock import SYSTEM_CLOCK, VirtualClock
+from geo_index import validate_location
 from sensors import SensorManager
 from trust_engine import TrustEngine
 from rules_engine import RulesEngine
 from bluetooth_comm import BluetoothManager
 
 
+class PipelineOutput:
+    """
+    Stand-in for sys.stdout while the pipeline runs, so output of its
+    threads never interleaves: each thread's text is written under one
+    lock in whole lines, and a stage's output for an analysis (see block)
+    is held back and written in one piece.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    def write(self, text: str) -> int:
+        pending = getattr(self.local, "pending", "") + text
+        if getattr(self.local, "in_block", False):
+            self.local.pending = pending
+            return len(text)
+        
+        lines, newline, rest = pending.rpartition("\n")
+        if newline:
+            with self.lock:
+                self.stream.write(lines + newline)
+        self.local.pending = rest
+        return len(text)
+    
+    def flush(self):
+        """Write out this thread's unfinished output."""
+        pending = getattr(self.local, "pending", "")
+        self.local.pending = ""
+        with self.lock:
+            self.stream.write(pending)
+            self.stream.flush()
+    
+    @contextmanager
+    def block(self):
+        """Hold back this thread's output until the block ends."""
+        self.local.in_block = True
+        try:
+            yield
+        finally:
+            self.local.in_block = False
+            self.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
 class AquaMind:
     """
     Main Aqua-Mind orchestrator class.
@@ -30,14 +82,28 @@ class AquaMind:
     
     VERSION = "1.0.0"
     
-    def __init__(self, profile: str = "JABALPUR", simulation_scenario: str = None):
+    # Analyses buffered between pipeline stages (see run_pipelined)
+    PIPELINE_QUEUE_SIZE = 4
+    
+    def __init__(self, profile: str = "JABALPUR", simulation_scenario: str = None,
+                 sample_rate: int = None, record_path: str = None,
+                 replay_path: str = None, adaptive: bool = False, clock=None):
         """
         Initialize Aqua-Mind system.
         
         Args:
             profile: Regional profile name (e.g., "JABALPUR", "JAIPUR")
             simulation_scenario: Optional simulation scenario for testing
+            sample_rate: If set, sample continuously at this rate (Hz) and
+                         analyze buffered samples instead of waiting
+            record_path: Record raw sensor samples to this trace file
+            replay_path: Replay a recorded trace instead of reading sensors
+            adaptive: Stop Tri-Check sampling early on stable readings
+            clock: Time source (default: SYSTEM_CLOCK; a VirtualClock runs
+                   simulated monitoring without waiting)
         """
+        self.clock = clock or SYSTEM_CLOCK
+        
         print("\n" + "=" * 60)
         print(f"  🌊 AQUA-MIND Water Quality Intelligence v{self.VERSION}")
         print(f"  📍 Profile: {profile}")
@@ -46,10 +112,16 @@ class AquaMind:
         # Initialize components
         print("\n📦 Initializing components...")
         
-        self.sensors = SensorManager(simulation_scenario=simulation_scenario)
-        self.trust_engine = TrustEngine(self.sensors, profile_name=profile)
+        self.sensors = SensorManager(simulation_scenario=simulation_scenario,
+                                     replay_path=replay_path)
+        if record_path:
+            self.sensors.start_recording(record_path)
+        if sample_rate:
+            self.sensors.start_sampling(rate_hz=sample_rate)
+        self.trust_engine = TrustEngine(self.sensors, profile_name=profile, adaptive=adaptive,
+                                        clock=self.clock)
         self.rules_engine = RulesEngine()
-        self.bluetooth = BluetoothManager()
+        self.bluetooth = BluetoothManager(clock=self.clock)
         
         # State
         self.running = False
@@ -63,6 +135,10 @@ class AquaMind:
         """Change the regional profile."""
         return self.trust_engine.set_profile(profile_name)
     
+    def set_location(self, lat: float, lon: float):
+        """Change to the regional profile for a GPS position."""
+        return self.trust_engine.select_by_location(lat, lon)
+    
     def set_scenario(self, scenario: str):
         """Change simulation scenario (for testing)."""
         self.sensors.set_scenario(scenario)
@@ -76,12 +152,15 @@ class AquaMind:
         """
         print("\n" + "=" * 60)
         print(f"  🔬 WATER ANALYSIS #{self.analysis_count + 1}")
-        print(f"  ⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"  ⏰ {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
         # Run trust engine analysis
         analysis = self.trust_engine.analyze_water()
-        
+        return self._apply_rules(analysis)
+    
+    def _apply_rules(self, analysis: dict) -> dict:
+        """Add rules-engine actions and advice to an analysis, then record it."""
         # Run rules engine for additional safety checks
         rules_input = {
             "tds_ppm": analysis["readings"]["tds_ppm"],
@@ -143,13 +222,32 @@ class AquaMind:
         
         print("\n" + "-" * 60)
     
+    def print_history(self):
+        """Print long-term statistics from the rollup history."""
+        history = self.trust_engine.history
+        spans = [("24 hours", 86400), ("7 days", 7 * 86400), ("30 days", 30 * 86400)]
+        sensors = [("tds", "TDS", "ppm"), ("turbidity", "Turbidity", "NTU"),
+                   ("temperature", "Temperature", "°C")]
+        
+        print("\n  📈 HISTORY:")
+        for sensor, name, unit in sensors:
+            print(f"     {name}:")
+            for label, seconds in spans:
+                summary = history.summary(sensor, seconds)
+                if summary is None:
+                    print(f"       {label:>8}: no data")
+                    continue
+                print(f"       {label:>8}: mean {summary['mean']:.2f} {unit}, "
+                      f"range {summary['min']:.2f}-{summary['max']:.2f}, "
+                      f"{summary['count']} readings")
+    
     def send_to_app(self, analysis: dict = None) -> bool:
         """
         Send analysis result to mobile app via Bluetooth.
         
         Args:
             analysis: Analysis to send (uses last if None)
-            
+        
         Returns:
             True if sent successfully
         """
@@ -182,6 +280,7 @@ class AquaMind:
         print("  [3] Change profile")
         print("  [4] Change scenario (sim only)")
         print("  [5] View last result")
+        print("  [6] View history")
         print("  [q] Quit")
         print("=" * 40)
         
@@ -191,35 +290,38 @@ class AquaMind:
                 
                 if cmd == "1":
                     self.analyze_once()
-                    
+                
                 elif cmd == "2":
                     self.send_to_app()
-                    
+                
                 elif cmd == "3":
                     profiles = self.trust_engine.geo_profile.list_profiles()
                     print(f"Available profiles: {', '.join(profiles)}")
                     profile = input("Enter profile name: ").strip().upper()
                     self.set_profile(profile)
-                    
+                
                 elif cmd == "4":
                     scenarios = ["clean_water", "tap_water", "dirty_water", "contaminated", "sensor_error"]
                     print(f"Available scenarios: {', '.join(scenarios)}")
                     scenario = input("Enter scenario: ").strip()
                     self.set_scenario(scenario)
-                    
+                
                 elif cmd == "5":
                     if self.last_analysis:
                         print(json.dumps(self.last_analysis, indent=2))
                     else:
                         print("No analysis yet. Run analysis first.")
-                        
+                
+                elif cmd == "6":
+                    self.print_history()
+                
                 elif cmd == "q" or cmd == "quit" or cmd == "exit":
                     self.running = False
                     print("👋 Goodbye!")
-                    
+                
                 else:
-                    print("Unknown command. Try 1, 2, 3, 4, 5, or q")
-                    
+                    print("Unknown command. Try 1, 2, 3, 4, 5, 6, or q")
+            
             except KeyboardInterrupt:
                 print("\n\n👋 Interrupted. Goodbye!")
                 self.running = False
@@ -249,11 +351,138 @@ class AquaMind:
                 
                 # Wait
                 print(f"\n⏳ Next analysis in {interval} seconds...")
-                time.sleep(interval)
+                self.clock.sleep(interval)
+        
+        except EOFError:
+            print("\n⏹️  Replay trace finished.")
+            self.running = False
+        except KeyboardInterrupt:
+            print("\n\n👋 Stopped. Goodbye!")
+            self.running = False
+    
+    def run_pipelined(self, interval: int = 60, max_analyses: int = None):
+        """
+        Run continuous monitoring as a three-stage pipeline:
+            
+            acquisition -> [queue] -> scoring/rules -> [queue] -> Bluetooth
+        
+        Analysis N+1 is acquired while analysis N is scored, evaluated
+        and sent. Acquisitions start every `interval` seconds on a fixed
+        schedule; a slow Bluetooth link only fills the bounded queues.
+        When the queue is still full at the next deadline the oldest
+        waiting acquisition is dropped, so the cadence is never pushed back.
+        On a virtual clock a full queue drops at once instead of waiting.
+        
+        Args:
+            interval: Seconds between acquisition starts
+            max_analyses: Stop after this many acquisitions (default: run until stopped)
+        """
+        print(f"\n🔄 PIPELINED CONTINUOUS MODE (interval: {interval}s)")
+        print("   Press Ctrl+C to stop")
+        print("-" * 40)
+        
+        self.running = True
+        to_score = queue.Queue(self.PIPELINE_QUEUE_SIZE)
+        to_send = queue.Queue(self.PIPELINE_QUEUE_SIZE)
+        counts = {"acquired": 0, "sent": 0, "dropped": 0}
+        output = PipelineOutput(sys.stdout)
+        
+        def score_stage():
+            while True:
+                acquisition = to_score.get()
+                if acquisition is None:
+                    to_send.put(None)
+                    return
+                try:
+                    with output.block():
+                        analysis = self._apply_rules(self.trust_engine.score(acquisition))
+                    to_send.put(analysis)
+                except Exception as e:
+                    print(f"❌ Error: {e}")
+        
+        def send_stage():
+            while True:
+                analysis = to_send.get()
+                if analysis is None:
+                    return
+                try:
+                    with output.block():
+                        if self.send_to_app(analysis):
+                            counts["sent"] += 1
+                except Exception as e:
+                    print(f"❌ Error: {e}")
+        
+        stages = [threading.Thread(target=score_stage, name="aquamind-score", daemon=True),
+                  threading.Thread(target=send_stage, name="aquamind-send", daemon=True)]
+        sys.stdout = output
+        for stage in stages:
+            stage.start()
+        
+        deadline = self.clock.monotonic()
+        try:
+            while self.running and (max_analyses is None or counts["acquired"] < max_analyses):
+                print("\n" + "=" * 60)
+                print(f"  🔬 WATER ANALYSIS #{counts['acquired'] + 1} (acquiring)")
+                print(f"  ⏰ {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                print("=" * 60)
+                
+                acquisition = self.trust_engine.acquire()
+                counts["acquired"] += 1
                 
+                # Wait for queue space only while there is slack before the next acquisition.
+                # Queue waits are in real seconds, so on a virtual clock don't wait at all.
+                deadline += interval
+                slack = deadline - self.clock.monotonic() if self.clock is SYSTEM_CLOCK else 0
+                if not self._put_latest(to_score, acquisition, slack):
+                    counts["dropped"] += 1
+                    print("⚠️  Pipeline backed up - dropped the oldest waiting acquisition")
+                
+                delay = deadline - self.clock.monotonic()
+                if delay > 0:
+                    print(f"\n⏳ Next analysis in {delay:.0f} seconds...")
+                    self.clock.sleep(delay)
+                else:
+                    deadline = self.clock.monotonic()  # Overran the interval - resync
+        
+        except EOFError:
+            print("\n⏹️  Replay trace finished.")
         except KeyboardInterrupt:
             print("\n\n👋 Stopped. Goodbye!")
+        finally:
             self.running = False
+            # Let the stages finish what is already queued
+            to_score.put(None)
+            for stage in stages:
+                stage.join()
+            output.flush()
+            sys.stdout = output.stream
+            print(f"📊 Pipeline: {counts['acquired']} acquired, {counts['sent']} sent, "
+                  f"{counts['dropped']} dropped")
+    
+    @staticmethod
+    def _put_latest(q: queue.Queue, item, timeout: float) -> bool:
+        """
+        Queue an item, waiting up to `timeout` seconds for space; if the
+        queue is still full, discard its oldest item to make room.
+        
+        Returns:
+            False if an item had to be dropped
+        """
+        try:
+            if timeout > 0:
+                q.put(item, timeout=timeout)
+            else:
+                q.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+        
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass  # The consumer took it meanwhile
+        q.put_nowait(item)  # Only this thread produces, so there is room now
+        return False
     
     def cleanup(self):
         """Clean up resources."""
@@ -272,7 +501,12 @@ Examples:
   python main.py                           # Interactive mode
   python main.py --scenario dirty          # Test with dirty water
   python main.py --profile JAIPUR          # Use Jaipur profile
+  python main.py --location 26.91,75.79    # Pick the profile for a GPS position
   python main.py --continuous --interval 30 # Monitor every 30 seconds
+  python main.py -c -i 30 --pipeline       # Acquire while the last result is sent
+  python main.py --single --record run.trace    # Record raw samples
+  python main.py --continuous --interval 0 --replay run.trace  # Reprocess a capture
+  python main.py -s tap_water -c -i 3600 --virtual-clock 2025-01-01  # Fast soak run
 
 Available profiles: JABALPUR, JAIPUR, CHENNAI, DELHI, GUWAHATI, MUMBAI
 Available scenarios: clean_water, tap_water, dirty_water, contaminated, sensor_error
@@ -285,6 +519,13 @@ Available scenarios: clean_water, tap_water, dirty_water, contaminated, sensor_e
         help="Regional profile to use (default: JABALPUR)"
     )
     
+    parser.add_argument(
+        "--location", "-l",
+        metavar="LAT,LON",
+        default=None,
+        help="GPS position; selects the nearest regional profile (overrides --profile)"
+    )
+    
     parser.add_argument(
         "--scenario", "-s",
         default=None,
@@ -304,6 +545,49 @@ Available scenarios: clean_water, tap_water, dirty_water, contaminated, sensor_e
         help="Interval between analyses in continuous mode (seconds)"
     )
     
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="In continuous mode, overlap acquisition with rules evaluation and Bluetooth sending"
+    )
+    
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=None,
+        help="Sample sensors continuously at this rate (Hz) in the background"
+    )
+    
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adaptive Tri-Check: stop early on stable water, sample longer on noisy water"
+    )
+    
+    parser.add_argument(
+        "--record",
+        metavar="TRACE",
+        default=None,
+        help="Record raw sensor samples to a binary trace file"
+    )
+    
+    parser.add_argument(
+        "--replay",
+        metavar="TRACE",
+        default=None,
+        help="Replay a recorded sensor trace instead of reading sensors"
+    )
+    
+    parser.add_argument(
+        "--virtual-clock",
+        metavar="START",
+        nargs="?",
+        const="now",
+        default=None,
+        help="Run on a virtual clock that skips waits, starting at START "
+             "(YYYY-MM-DD, default now). Use with --scenario or --replay."
+    )
+    
     parser.add_argument(
         "--single",
         action="store_true",
@@ -312,26 +596,54 @@ Available scenarios: clean_water, tap_water, dirty_water, contaminated, sensor_e
     
     args = parser.parse_args()
     
+    clock = None
+    if args.virtual_clock:
+        if args.scenario is None and args.replay is None:
+            parser.error("--virtual-clock needs --scenario or --replay (real sensors run in real time)")
+        start = None if args.virtual_clock == "now" else datetime.fromisoformat(args.virtual_clock)
+        clock = VirtualClock(start)
+    
+    location = None
+    if args.location:
+        try:
+            lat, lon = (float(part) for part in args.location.split(","))
+        except ValueError:
+            parser.error("--location must be LAT,LON in degrees (e.g. 23.18,79.99)")
+        try:
+            location = validate_location({"lat": lat, "lon": lon})[:2]
+        except ValueError as e:
+            parser.error(f"--location: {e}")
+    
     # Create Aqua-Mind instance
     aqua = AquaMind(
         profile=args.profile,
-        simulation_scenario=args.scenario
+        simulation_scenario=args.scenario,
+        sample_rate=args.sample_rate,
+        record_path=args.record,
+        replay_path=args.replay,
+        adaptive=args.adaptive,
+        clock=clock
     )
+    if location:
+        aqua.set_location(*location)
     
     try:
         if args.single:
             # Single analysis mode
             analysis = aqua.analyze_once()
             aqua.send_to_app(analysis)
-            
+        
         elif args.continuous:
             # Continuous monitoring mode
-            aqua.run_continuous(interval=args.interval)
-            
+            if args.pipeline:
+                aqua.run_pipelined(interval=args.interval)
+            else:
+                aqua.run_continuous(interval=args.interval)
+        
         else:
             # Interactive mode
             aqua.run_interactive()
-            
+    
     finally:
         aqua.cleanup()
 
@@ -0,0 +1,461 @@
+"""
+Aqua-Mind Profile Catalog
+=========================
+Lazy, precompiled access to profiles.json.
+
+A catalog can hold thousands of village and block profiles, so it is not
+parsed on every start. The first load scans profiles.json once, validates
+every profile and compiles it (normalized weights and seasonal modifiers
+for each month), and writes the result to profiles.cache next to it:
+    
+    magic + version
+    one pickled record per profile    <- read with a seek when selected
+    pickled header                    <- fingerprint, metadata, name -> (zone, offset, length),
+                                         name -> location
+    header offset (uint64)
+
+Later starts - e.g. each cron-driven `main.py --single` - unpickle only
+the header. The cache is keyed by the catalog's size, mtime and SHA-256:
+a size or mtime change makes it re-hash the file, and only a content
+change recompiles it.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from geo_index import GeoIndex, validate_location
+
+CACHE_MAGIC = b"AQPC"
+CACHE_VERSION = 2
+CACHE_PREAMBLE = struct.Struct("<4sH")
+CACHE_FOOTER = struct.Struct("<Q")
+
+# Default weights, as used by GeoProfile.get_weights
+DEFAULT_TDS_WEIGHT = 0.5
+DEFAULT_TURB_WEIGHT = 0.4
+
+NORMAL_SEASON = ("normal", 1.0, 1.0, "")
+
+
+class CatalogError(ValueError):
+    """profiles.json could not be loaded."""
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while text[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def _next_member(text: str, pos: int) -> int:
+    """
+    Skip the separator after an object member.
+    
+    Returns:
+        Position of the next key, or of the object's closing '}'
+    """
+    pos = _skip_whitespace(text, pos)
+    if text[pos] == ',':
+        pos = _skip_whitespace(text, pos + 1)
+        if text[pos] != '"':
+            raise CatalogError(f"Expected a property name at character {pos}")
+    elif text[pos] != '}':
+        raise CatalogError(f"Expected ',' or '}}' at character {pos}")
+    return pos
+
+
+def fingerprint(path: Path) -> Tuple[int, int, str]:
+    """(size, mtime_ns, sha256 hex) of a file."""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+
+def scan_catalog(raw: bytes) -> Tuple[Dict, List[Tuple[str, int, int, Dict]]]:
+    """
+    Parse a profiles.json document, keeping each profile's byte range.
+    
+    Args:
+        raw: File contents
+    
+    Returns:
+        Tuple of (top-level metadata without "profiles",
+                  [(name, byte offset, byte length, profile), ...])
+    
+    Raises:
+        CatalogError: If the document is not a valid catalog
+    """
+    try:
+        text = raw.decode('utf-8')
+        data_start = _skip_whitespace(text, 0)
+        if text[data_start] != '{':
+            raise CatalogError("Catalog must be a JSON object")
+    except (UnicodeDecodeError, IndexError) as e:
+        raise CatalogError(str(e)) from e
+    
+    decoder = json.JSONDecoder()
+    ascii_only = len(raw) == len(text)
+    
+    # Character index -> byte offset, computed incrementally
+    byte_pos = [0, 0]  # (char index, byte offset) of the last conversion
+    
+    def to_bytes(index: int) -> int:
+        if ascii_only:
+            return index
+        char_index, byte_offset = byte_pos
+        byte_offset += len(text[char_index:index].encode('utf-8'))
+        byte_pos[:] = [index, byte_offset]
+        return byte_offset
+    
+    meta = {}
+    profiles = []
+    
+    try:
+        pos = _skip_whitespace(text, data_start + 1)
+        while text[pos] != '}':
+            if text[pos] != '"':
+                raise CatalogError(f"Expected a property name at character {pos}")
+            key, pos = decoder.raw_decode(text, pos)
+            pos = _skip_whitespace(text, pos)
+            if text[pos] != ':':
+                raise CatalogError(f"Expected ':' at character {pos}")
+            pos = _skip_whitespace(text, pos + 1)
+            
+            if key == "profiles" and text[pos] == '{':
+                pos = _skip_whitespace(text, pos + 1)
+                while text[pos] != '}':
+                    if text[pos] != '"':
+                        raise CatalogError(f"Expected a property name at character {pos}")
+                    name, pos = decoder.raw_decode(text, pos)
+                    pos = _skip_whitespace(text, pos)
+                    if text[pos] != ':':
+                        raise CatalogError(f"Expected ':' at character {pos}")
+                    pos = _skip_whitespace(text, pos + 1)
+                    
+                    profile, end = decoder.raw_decode(text, pos)
+                    start_byte = to_bytes(pos)
+                    profiles.append((name, start_byte, to_bytes(end) - start_byte, profile))
+                    
+                    pos = _next_member(text, end)
+                pos += 1
+            else:
+                meta[key], pos = decoder.raw_decode(text, pos)
+            
+            pos = _next_member(text, pos)
+        
+        if text[pos + 1:].strip(" \t\r\n"):
+            raise CatalogError(f"Extra data at character {pos + 1}")
+    except json.JSONDecodeError as e:
+        raise CatalogError(str(e)) from e
+    except IndexError as e:
+        raise CatalogError("Unexpected end of catalog") from e
+    
+    return meta, profiles
+
+
+def _number(value, field: str, positive: bool = False) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{field} must be a number")
+    if value < 0 or (positive and value == 0):
+        raise ValueError(f"{field} must be {'positive' if positive else 'non-negative'}")
+    return value
+
+
+def compile_profile(profile: Dict) -> Dict:
+    """
+    Validate a profile and precompute its seasonal weights.
+    
+    Args:
+        profile: Profile as in profiles.json
+    
+    Returns:
+        {"profile": profile, "months": [None, month 1 .. month 12]} where
+        each month is (season, tds_modifier, turb_modifier, alert,
+        normalized tds weight, normalized turbidity weight)
+    
+    Raises:
+        ValueError: If the profile is invalid
+    """
+    if not isinstance(profile, dict):
+        raise ValueError("profile must be an object")
+    
+    tds_weight = _number(profile.get("tds_weight", DEFAULT_TDS_WEIGHT), "tds_weight")
+    turb_weight = _number(profile.get("turb_weight", DEFAULT_TURB_WEIGHT), "turb_weight")
+    
+    thresholds = profile.get("thresholds", {})
+    if not isinstance(thresholds, dict):
+        raise ValueError("thresholds must be an object")
+    for key in ("tds_unsafe", "turb_unsafe"):
+        if key in thresholds:
+            _number(thresholds[key], f"thresholds.{key}", positive=True)
+    
+    if "location" in profile:
+        validate_location(profile["location"])
+    
+    seasonal = profile.get("seasonal_adjustments", {})
+    if not isinstance(seasonal, dict):
+        raise ValueError("seasonal_adjustments must be an object")
+    
+    # First season listing a month wins, as in GeoProfile.get_seasonal_modifier
+    seasons = [NORMAL_SEASON] * 13
+    assigned = set()
+    for season, config in seasonal.items():
+        if not isinstance(config, dict):
+            raise ValueError(f"{season}: season must be an object")
+        tds_modifier = _number(config.get("tds_weight_modifier", 1.0), f"{season}.tds_weight_modifier")
+        turb_modifier = _number(config.get("turb_weight_modifier", 1.0), f"{season}.turb_weight_modifier")
+        for month in config.get("months", []):
+            if not isinstance(month, int) or not 1 <= month <= 12:
+                raise ValueError(f"{season}: invalid month {month!r}")
+            if month not in assigned:
+                assigned.add(month)
+                seasons[month] = (season, tds_modifier, turb_modifier, config.get("alert", ""))
+    
+    months = [None]
+    for month in range(1, 13):
+        season, tds_modifier, turb_modifier, alert = seasons[month]
+        w_tds = tds_weight * tds_modifier
+        w_turb = turb_weight * turb_modifier
+        total_weight = w_tds + w_turb
+        if total_weight <= 0:
+            raise ValueError(f"tds and turbidity weights are both zero in month {month}")
+        months.append((season, tds_modifier, turb_modifier, alert,
+                       w_tds / total_weight, w_turb / total_weight))
+    
+    return {"profile": profile, "months": months}
+
+
+def compile_catalog(path: Path, cache_path: Path, source: Tuple[int, int, str]) -> Optional[Dict]:
+    """
+    Compile profiles.json into a cache file.
+    
+    Invalid profiles are reported and left out.
+    
+    Returns:
+        The cache header, or None if the cache could not be written
+    
+    Raises:
+        CatalogError: If the catalog cannot be parsed
+    """
+    with open(path, 'rb') as f:
+        meta, profiles = scan_catalog(f.read())
+    
+    entries = {}
+    locations = {}
+    tmp_path = None
+    try:
+        # Unique temp name - several processes (e.g. cron runs) may compile at once
+        with tempfile.NamedTemporaryFile('wb', dir=cache_path.parent, prefix=cache_path.name + ".",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            f.write(CACHE_PREAMBLE.pack(CACHE_MAGIC, CACHE_VERSION))
+            for name, _, _, profile in profiles:
+                try:
+                    record = pickle.dumps(compile_profile(profile), pickle.HIGHEST_PROTOCOL)
+                except ValueError as e:
+                    print(f"⚠️  Skipping invalid profile {name}: {e}")
+                    continue
+                zone = profile.get("zone", "Unknown")
+                entries[name] = (zone, f.tell(), len(record))
+                f.write(record)
+                if "location" in profile:
+                    locations[name] = validate_location(profile["location"])
+            
+            header = {"source": source, "meta": meta, "profiles": entries, "locations": locations}
+            header_offset = f.tell()
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+            f.write(CACHE_FOOTER.pack(header_offset))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return None  # Read-only install
+    
+    return header
+
+
+def read_cache_header(cache_path: Path) -> Optional[Dict]:
+    """Read a cache file's header, or None if it is missing or unreadable."""
+    try:
+        with open(cache_path, 'rb') as f:
+            magic, version = CACHE_PREAMBLE.unpack(f.read(CACHE_PREAMBLE.size))
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                return None
+            f.seek(-CACHE_FOOTER.size, os.SEEK_END)
+            (header_offset,) = CACHE_FOOTER.unpack(f.read(CACHE_FOOTER.size))
+            f.seek(header_offset)
+            return pickle.load(f)
+    except (OSError, struct.error, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+
+
+def write_cache_header(cache_path: Path, header: Dict):
+    """Replace a cache file's header, keeping its records."""
+    try:
+        with open(cache_path, 'r+b') as f:
+            f.seek(-CACHE_FOOTER.size, os.SEEK_END)
+            (header_offset,) = CACHE_FOOTER.unpack(f.read(CACHE_FOOTER.size))
+            f.seek(header_offset)
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+            f.write(CACHE_FOOTER.pack(header_offset))
+            f.truncate()
+    except OSError:
+        pass  # Read-only install - the content check simply repeats next time
+
+
+class ProfileCatalog(Mapping):
+    """
+    Read-only mapping of profile name -> profile dict, loaded on access.
+    compiled(name) also gives the precomputed month table.
+    """
+    
+    # Open catalogs by path, shared by every GeoProfile in the process
+    _open: Dict[Path, "ProfileCatalog"] = {}
+    
+    def __init__(self, path: Path, meta: Dict, entries: Dict[str, Tuple[str, int, int]],
+                 locations: Dict[str, Tuple[float, float, float]],
+                 source: Tuple[int, int, str], records_path: Optional[Path]):
+        """
+        Args:
+            path: profiles.json
+            meta: Top-level catalog keys other than "profiles"
+            entries: name -> (zone, offset, length) of its record
+            locations: name -> (lat, lon, radius_km) of located profiles
+            source: Fingerprint of profiles.json
+            records_path: Cache file holding the records, or None to read
+                          (and compile) profiles from the JSON ranges
+        """
+        self.path = Path(path)
+        self.meta = meta
+        self._entries = entries
+        self.locations = locations
+        self._geo_index: Optional[GeoIndex] = None
+        self._source = source
+        self._records_path = records_path
+        self._compiled: Dict[str, Dict] = {}
+    
+    @staticmethod
+    def cache_path(path: Path) -> Path:
+        """Where the compiled cache for a catalog is kept."""
+        path = Path(path)
+        return path.with_name(path.stem + ".cache")
+    
+    @classmethod
+    def open(cls, path: Path) -> "ProfileCatalog":
+        """
+        Open a catalog, using (or building) its compiled cache.
+        
+        Raises:
+            FileNotFoundError: If the catalog does not exist
+            CatalogError: If it cannot be parsed
+        """
+        path = Path(path).resolve()
+        stat = os.stat(path)
+        
+        catalog = cls._open.get(path)
+        if catalog is not None and catalog._source[:2] == (stat.st_size, stat.st_mtime_ns):
+            return catalog
+        
+        catalog = cls._load(path, stat)
+        cls._open[path] = catalog
+        return catalog
+    
+    @classmethod
+    def _load(cls, path: Path, stat: os.stat_result) -> "ProfileCatalog":
+        cache_path = cls.cache_path(path)
+        header = read_cache_header(cache_path)
+        
+        if header is not None:
+            size, mtime_ns, digest = header["source"]
+            if (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return cls(path, header["meta"], header["profiles"], header["locations"],
+                           header["source"], cache_path)
+        
+        # Size or mtime changed (or no cache) - only recompile if the content did
+        source = fingerprint(path)
+        if header is not None and (header["source"][0], header["source"][2]) == (source[0], source[2]):
+            # Touched but unchanged (e.g. redeployed) - just record the new mtime
+            header["source"] = source
+            write_cache_header(cache_path, header)
+            return cls(path, header["meta"], header["profiles"], header["locations"],
+                       source, cache_path)
+        
+        header = compile_catalog(path, cache_path, source)
+        if header is not None:
+            return cls(path, header["meta"], header["profiles"], header["locations"],
+                       source, cache_path)
+        
+        # Cache not writable - index the JSON itself and compile on access
+        with open(path, 'rb') as f:
+            meta, profiles = scan_catalog(f.read())
+        entries = {}
+        locations = {}
+        for name, offset, length, profile in profiles:
+            # Same validation as compile_catalog, so invalid profiles are absent either way
+            try:
+                compile_profile(profile)
+            except ValueError as e:
+                print(f"⚠️  Skipping invalid profile {name}: {e}")
+                continue
+            entries[name] = (profile.get("zone", "Unknown"), offset, length)
+            if "location" in profile:
+                locations[name] = validate_location(profile["location"])
+        return cls(path, meta, entries, locations, source, None)
+    
+    def zone(self, name: str) -> str:
+        """Zone of a profile, without loading it."""
+        return self._entries[name][0]
+    
+    def geo_index(self) -> GeoIndex:
+        """Spatial index of located profiles, built on first use."""
+        if self._geo_index is None:
+            self._geo_index = GeoIndex(self.locations)
+        return self._geo_index
+    
+    def compiled(self, name: str) -> Dict:
+        """
+        Validated profile and its month table (see compile_profile).
+        
+        Raises:
+            KeyError: If the profile does not exist
+            ValueError: If it cannot be read back (uncached catalog
+                        modified since it was opened)
+        """
+        record = self._compiled.get(name)
+        if record is None:
+            _, offset, length = self._entries[name]
+            if self._records_path is not None:
+                with open(self._records_path, 'rb') as f:
+                    f.seek(offset)
+                    record = pickle.loads(f.read(length))
+            else:
+                with open(self.path, 'rb') as f:
+                    f.seek(offset)
+                    record = compile_profile(json.loads(f.read(length).decode('utf-8')))
+            self._compiled[name] = record
+        return record
+    
+    def __getitem__(self, name: str) -> Dict:
+        return self.compiled(name)["profile"]
+    
+    def __contains__(self, name) -> bool:
+        return name in self._entries
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -13,8 +13,20 @@ Hardware Requirements:
 import time
 import random
 import os
-import json
+import struct
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
+
+from calibration import Calibration, calibration_file
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
 
 # Detect if running on Raspberry Pi
 IS_RASPBERRY_PI = os.path.exists('/proc/device-tree/model')
@@ -32,6 +44,279 @@ else:
     print("🖥️  Not running on Raspberry Pi. SIMULATION mode enabled.")
 
 
+W1_DEVICES_DIR = '/sys/bus/w1/devices/'
+
+
+class HardwareBackend:
+    """
+    The device interfaces HardwareSensors talks to: spidev, RPi.GPIO,
+    the spidev ioctl and the 1-Wire sysfs directory. The default is the
+    real Raspberry Pi stack; fake_hardware.FakeHardware stands in for it
+    off-device.
+    """
+    
+    def __init__(self, spidev, gpio, ioctl=None, w1_devices_dir=W1_DEVICES_DIR):
+        """
+        Args:
+            spidev: Module providing SpiDev
+            gpio: RPi.GPIO-compatible module
+            ioctl: fcntl.ioctl-compatible function (None disables batched bursts)
+            w1_devices_dir: 1-Wire sysfs devices directory
+        """
+        self.spidev = spidev
+        self.GPIO = gpio
+        self.ioctl = ioctl
+        self.w1_devices_dir = w1_devices_dir
+
+
+SYSTEM_BACKEND = (
+    HardwareBackend(spidev, GPIO, fcntl.ioctl if fcntl else None)
+    if HARDWARE_AVAILABLE else None
+)
+
+
+def find_ds18b20(base_dir=W1_DEVICES_DIR, device_id=None):
+    """
+    Locate a DS18B20 on the 1-Wire bus.
+    
+    Args:
+        base_dir: 1-Wire sysfs devices directory (override for tests)
+        device_id: Specific sensor, e.g. "28-0316a2794aff" (default: first found)
+        
+    Returns:
+        Path to its w1_slave file, or None if no sensor is present
+    """
+    try:
+        device_folders = sorted(f for f in os.listdir(base_dir) if f.startswith('28-'))
+    except OSError:
+        return None
+    
+    if device_id is not None:
+        device_folders = [f for f in device_folders if f == device_id]
+    
+    if not device_folders:
+        return None
+    return os.path.join(base_dir, device_folders[0], 'w1_slave')
+
+
+def parse_w1_slave(lines):
+    """
+    Parse the contents of a DS18B20 w1_slave file.
+    
+    Args:
+        lines: Lines of the file, e.g.
+               ["72 01 4b 46 7f ff 0e 10 57 : crc=57 YES",
+                "72 01 4b 46 7f ff 0e 10 57 t=23125"]
+        
+    Returns:
+        Tuple of (temperature_c or None, crc_ok)
+    """
+    if len(lines) < 2:
+        return None, False
+    
+    crc_ok = lines[0].strip()[-3:] == 'YES'
+    if not crc_ok:
+        return None, False
+    
+    equals_pos = lines[1].find('t=')
+    if equals_pos == -1:
+        return None, True
+    
+    try:
+        return round(float(lines[1][equals_pos + 2:]) / 1000.0, 1), True
+    except ValueError:
+        return None, True
+
+
+class TemperaturePoller:
+    """
+    Background DS18B20 reader.
+    A 1-Wire conversion blocks for ~750 ms, so a daemon thread keeps the
+    latest temperature cached and callers read it without waiting.
+    """
+    
+    DEFAULT_TEMPERATURE = 25.0
+    
+    def __init__(self, device_path, interval=2.0):
+        """
+        Args:
+            device_path: Path to the sensor's w1_slave file
+            interval: Seconds between background reads
+        """
+        self.device_path = device_path
+        self.interval = interval
+        
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # Last good temperature and when it was read (time.monotonic)
+        self._temperature = None
+        self._timestamp = None
+        # CRC status of the most recent read attempt
+        self._crc_ok = False
+    
+    def start(self):
+        """Start the background polling thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background polling thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def _poll_loop(self):
+        """Background loop: read, then wait for the next interval."""
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+    
+    def poll_once(self):
+        """
+        Read the sensor now (blocking) and update the cache.
+        
+        Returns:
+            True if a valid temperature was read
+        """
+        try:
+            with open(self.device_path, 'r') as f:
+                lines = f.readlines()
+            temperature, crc_ok = parse_w1_slave(lines)
+        except OSError:
+            temperature, crc_ok = None, False
+        
+        with self._lock:
+            self._crc_ok = crc_ok
+            if temperature is not None:
+                self._temperature = temperature
+                self._timestamp = time.monotonic()
+        
+        return temperature is not None
+    
+    def latest(self):
+        """
+        Get the cached state without touching the sensor.
+        
+        Returns:
+            Tuple of (temperature_c or None, monotonic timestamp or None, crc_ok)
+        """
+        with self._lock:
+            return self._temperature, self._timestamp, self._crc_ok
+    
+    def read_temperature(self, max_age=None):
+        """
+        Get the cached temperature.
+        
+        Args:
+            max_age: Maximum acceptable age in seconds. If the cache is older
+                     (or empty), the sensor is read synchronously; if that
+                     fails too, the stale value is not used. None accepts
+                     any cached value.
+                     
+        Returns:
+            Temperature in Celsius (DEFAULT_TEMPERATURE if the sensor fails)
+        """
+        return self.status(max_age)["temperature_c"]
+    
+    def status(self, max_age=None):
+        """
+        Get the temperature with its health, refreshing it like
+        read_temperature does.
+        
+        Args:
+            max_age: Maximum acceptable age in seconds (None: any)
+        
+        Returns:
+            Dict with temperature_c (DEFAULT_TEMPERATURE when stale),
+            age_s of the last good read (None if never read), crc_ok of
+            the most recent read attempt, and stale
+        """
+        if self._is_stale(self.latest()[1], max_age):
+            self.poll_once()
+        
+        temperature, timestamp, crc_ok = self.latest()
+        stale = self._is_stale(timestamp, max_age)
+        return {
+            "temperature_c": self.DEFAULT_TEMPERATURE if stale else temperature,
+            "age_s": None if timestamp is None else round(time.monotonic() - timestamp, 1),
+            "crc_ok": crc_ok,
+            "stale": stale
+        }
+    
+    @staticmethod
+    def _is_stale(timestamp, max_age):
+        """True if a read at `timestamp` is missing or older than max_age."""
+        return timestamp is None or (
+            max_age is not None and time.monotonic() - timestamp > max_age
+        )
+
+
+@dataclass
+class Probe:
+    """
+    One probe set (TDS + Turbidity, optional DS18B20) on an MCP3008.
+    """
+    name: str
+    bus: int = 0                      # SPI bus (0 = SPI0)
+    device: int = 0                   # Chip select (0 = CE0, 1 = CE1)
+    tds_channel: int = 0              # MCP3008 channel 0-7
+    turbidity_channel: int = 1        # MCP3008 channel 0-7
+    ds18b20_id: Optional[str] = None  # 1-Wire ID, None = first sensor found
+
+
+class ProbeRegistry:
+    """
+    Registry of probes and the ADC channels they occupy.
+    Rejects probes that would share an ADC channel.
+    """
+    
+    MAX_CHIP_SELECTS = 3  # SPI1 has CE0-CE2; SPI0 has CE0-CE1
+    
+    def __init__(self):
+        self.probes = {}
+        self._channels = {}  # (bus, device, channel) -> probe name
+    
+    def register(self, probe):
+        """
+        Add a probe.
+        
+        Raises:
+            ValueError: On a duplicate name, invalid channel or channel conflict
+        """
+        if probe.name in self.probes:
+            raise ValueError(f"Probe '{probe.name}' already registered")
+        if not 0 <= probe.device < self.MAX_CHIP_SELECTS:
+            raise ValueError(f"Invalid chip select CE{probe.device} for probe '{probe.name}'")
+        
+        claimed = {}
+        for channel in (probe.tds_channel, probe.turbidity_channel):
+            if not 0 <= channel <= 7:
+                raise ValueError(f"Invalid MCP3008 channel {channel} for probe '{probe.name}'")
+            key = (probe.bus, probe.device, channel)
+            owner = self._channels.get(key, claimed.get(key))
+            if owner is not None:
+                raise ValueError(f"SPI{probe.bus} CE{probe.device} channel {channel} "
+                                 f"already used by probe '{owner}'")
+            claimed[key] = probe.name
+        
+        self._channels.update(claimed)
+        self.probes[probe.name] = probe
+    
+    def by_bus(self):
+        """Group probe names by SPI bus."""
+        buses = {}
+        for probe in self.probes.values():
+            buses.setdefault(probe.bus, []).append(probe.name)
+        return buses
+
+
 class SimulatedSensors:
     """
     Simulates sensor readings for testing without hardware.
@@ -86,7 +371,23 @@ class SimulatedSensors:
         }
     }
     
-    def __init__(self, scenario="tap_water"):
+    # ADC channel numbers (mirroring HardwareSensors)
+    TDS_CHANNEL = 0
+    TURBIDITY_CHANNEL = 1
+    
+    # Channel -> (base key, noise key, full-scale value mapped onto 0-1023)
+    _CHANNEL_PARAMS = {
+        TDS_CHANNEL: ("tds_base", "tds_noise", 1000),       # 0-1000 ppm
+        TURBIDITY_CHANNEL: ("turb_base", "turb_noise", 20)  # 0-20 NTU
+    }
+    
+    def __init__(self, scenario="tap_water", seed=None):
+        """
+        Args:
+            scenario: One of SCENARIOS
+            seed: Optional seed for reproducible readings
+        """
+        self.rng = random.Random(seed)
         self.set_scenario(scenario)
         self._button_pressed = False
         print(f"🧪 Simulation initialized with scenario: {scenario}")
@@ -99,38 +400,52 @@ class SimulatedSensors:
         self.scenario = scenario
         self._params = self.SCENARIOS[scenario]
     
-    def read_tds_raw(self):
-        """Simulate raw TDS ADC reading (0-1023)."""
-        base = self._params["tds_base"]
-        noise = self._params["tds_noise"]
-        stability = self._params["stability"]
+    def read_many(self, channel, n, rng=None):
+        """
+        Simulate a burst of raw ADC readings (0-1023) in one call.
         
+        Args:
+            channel: TDS_CHANNEL or TURBIDITY_CHANNEL
+            n: Number of samples
+            rng: Optional random.Random to draw from (default: this
+                 instance's seeded generator)
+                 
+        Returns:
+            array('H') of n raw ADC values
+        """
+        if channel not in self._CHANNEL_PARAMS:
+            return array('H', bytes(2 * n))
+        
+        base_key, noise_key, full_scale = self._CHANNEL_PARAMS[channel]
+        base = self._params[base_key]
+        noise = self._params[noise_key]
         # Add instability factor
-        drift = random.gauss(0, noise * (1 - stability))
-        value = base + random.gauss(0, noise) + drift
+        drift = noise * (1 - self._params["stability"])
+        scale = 1023 / full_scale
+        gauss = (rng or self.rng).gauss
         
-        # Convert to ADC range (0-1023), assuming 0-1000ppm maps to 0-1023
-        adc_value = int((value / 1000) * 1023)
-        return max(0, min(1023, adc_value))
+        return array('H', [
+            max(0, min(1023, int((base + gauss(0, noise) + gauss(0, drift)) * scale)))
+            for _ in range(n)
+        ])
+    
+    def read_burst(self, channel, n):
+        """Simulate a burst read (same interface as HardwareSensors)."""
+        return self.read_many(channel, n)
+    
+    def read_tds_raw(self):
+        """Simulate raw TDS ADC reading (0-1023)."""
+        return self.read_many(self.TDS_CHANNEL, 1)[0]
     
     def read_turbidity_raw(self):
         """Simulate raw Turbidity ADC reading (0-1023)."""
-        base = self._params["turb_base"]
-        noise = self._params["turb_noise"]
-        stability = self._params["stability"]
-        
-        drift = random.gauss(0, noise * (1 - stability))
-        value = base + random.gauss(0, noise) + drift
-        
-        # Convert to ADC range (0-1023), assuming 0-20 NTU maps to 0-1023
-        adc_value = int((value / 20) * 1023)
-        return max(0, min(1023, adc_value))
+        return self.read_many(self.TURBIDITY_CHANNEL, 1)[0]
     
     def read_temperature(self):
         """Simulate temperature reading in Celsius."""
         base = self._params["temp_base"]
         noise = self._params["temp_noise"]
-        return round(base + random.gauss(0, noise), 1)
+        return round(base + self.rng.gauss(0, noise), 1)
     
     def is_button_pressed(self):
         """Simulate button press (random for demo)."""
@@ -160,61 +475,109 @@ class HardwareSensors:
     TDS_CHANNEL = 0
     TURBIDITY_CHANNEL = 1
     
-    # Calibration file
-    CALIBRATION_FILE = Path(__file__).parent / "calibration.json"
+    # Temperature readings older than this are refreshed synchronously
+    TEMPERATURE_MAX_AGE = 10.0
     
-    def __init__(self):
-        if not HARDWARE_AVAILABLE:
+    # Burst acquisition: one spi_ioc_transfer per 3-byte conversion frame.
+    # SPI_IOC_MESSAGE(n) encodes n * 32 bytes in a 14-bit size field, so at
+    # most 511 frames fit in a single ioctl. The message is a bytearray:
+    # fcntl.ioctl copies immutable arguments into a 1024-byte buffer and
+    # rejects anything longer, but passes mutable ones to the kernel in place.
+    BURST_FRAMES_PER_IOCTL = 511
+    _SPI_IOC_TRANSFER = struct.Struct("=QQIIHBBBBBB")
+    
+    # Device handles shared by every probe in the process, as [handle, users]
+    # and released by cleanup() when the last user goes:
+    # open SpiDev per (backend, bus, chip select)
+    _spi_devices = {}
+    # one poller per DS18B20 w1_slave path
+    _temperature_pollers = {}
+    # GPIO setup per backend (the handle is the backend's GPIO module)
+    _gpio_users = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, probe=None, backend=None):
+        """
+        Args:
+            probe: Probe wiring (default: CE0 on SPI0, channels 0 and 1)
+            backend: HardwareBackend to drive (default: the Raspberry Pi's own)
+        """
+        self.backend = backend or SYSTEM_BACKEND
+        if self.backend is None:
             raise RuntimeError("Hardware libraries not available!")
+        self.gpio = self.backend.GPIO
+        self._ioctl = self.backend.ioctl
+        
+        self.probe = probe or Probe("main")
+        self.TDS_CHANNEL = self.probe.tds_channel
+        self.TURBIDITY_CHANNEL = self.probe.turbidity_channel
         
         # Initialize SPI for MCP3008
-        self.spi = spidev.SpiDev()
-        self.spi.open(0, 0)  # Bus 0, Device 0 (CE0)
-        self.spi.max_speed_hz = 1350000
+        self.spi = self._open_spi(self.probe.bus, self.probe.device)
+        self._spi_fd = self._open_spi_fileno()
+        self._burst_plans = {}
         
         # Initialize GPIO
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        
-        # Load calibration
-        self.calibration = self._load_calibration()
+        self._acquire_shared(self._gpio_users, self.backend, self._setup_gpio)
         
         # Initialize DS18B20
         self._init_ds18b20()
         
-        print("✅ Hardware sensors initialized")
+        print(f"✅ Hardware sensors initialized (probe '{self.probe.name}': "
+              f"SPI{self.probe.bus} CE{self.probe.device})")
     
-    def _load_calibration(self):
-        """Load calibration offsets from file."""
-        default = {
-            "tds_offset": 0,
-            "tds_scale": 1.0,
-            "turb_offset": 0,
-            "turb_scale": 1.0
-        }
-        
-        if self.CALIBRATION_FILE.exists():
-            try:
-                with open(self.CALIBRATION_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
+    @classmethod
+    def _acquire_shared(cls, registry, key, create):
+        """Get a shared handle, creating it for the first user."""
+        with cls._shared_lock:
+            entry = registry.get(key)
+            if entry is None:
+                entry = registry[key] = [create(), 0]
+            entry[1] += 1
+            return entry[0]
+    
+    @classmethod
+    def _release_shared(cls, registry, key, close):
+        """Drop one user of a shared handle, closing it after the last."""
+        with cls._shared_lock:
+            entry = registry.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del registry[key]
+        close(entry[0])
+    
+    def _setup_gpio(self):
+        """Configure the calibration button input."""
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(self.BUTTON_PIN, self.gpio.IN, pull_up_down=self.gpio.PUD_UP)
+        return self.gpio
+    
+    def _open_spi(self, bus, device):
+        """Open (or reuse) the SpiDev for an MCP3008 chip select."""
+        def open_spi():
+            spi = self.backend.spidev.SpiDev()
+            spi.open(bus, device)
+            spi.max_speed_hz = 1350000
+            return spi
         
-        return default
+        self._spi_key = (self.backend, bus, device)
+        return self._acquire_shared(self._spi_devices, self._spi_key, open_spi)
     
     def _init_ds18b20(self):
         """Initialize DS18B20 1-Wire temperature sensor."""
-        # Enable 1-Wire interface
-        base_dir = '/sys/bus/w1/devices/'
-        try:
-            device_folders = [f for f in os.listdir(base_dir) if f.startswith('28-')]
-            if device_folders:
-                self.ds18b20_path = base_dir + device_folders[0] + '/w1_slave'
-            else:
-                self.ds18b20_path = None
-                print("⚠️  DS18B20 not found. Temperature will be estimated.")
-        except:
-            self.ds18b20_path = None
+        self.ds18b20_path = find_ds18b20(self.backend.w1_devices_dir, self.probe.ds18b20_id)
+        self.temperature_poller = None
+        
+        if self.ds18b20_path:
+            poller = self._acquire_shared(self._temperature_pollers, self.ds18b20_path,
+                                          lambda: TemperaturePoller(self.ds18b20_path))
+            poller.start()
+            self.temperature_poller = poller
+        else:
+            print("⚠️  DS18B20 not found. Temperature will be estimated.")
     
     def _read_adc(self, channel):
         """Read raw value from MCP3008 ADC channel (0-7)."""
@@ -226,6 +589,98 @@ class HardwareSensors:
         value = ((adc[1] & 3) << 8) + adc[2]
         return value
     
+    def read_burst(self, channel, n):
+        """
+        Read n consecutive samples from an MCP3008 channel.
+        
+        Conversion frames are queued into as few SPI_IOC_MESSAGE ioctls as
+        possible. Chip select is released between frames (the MCP3008 only
+        starts a new conversion on a CS falling edge), but held for the
+        whole batch at the kernel level, so there is no Python round-trip
+        per sample.
+        
+        Args:
+            channel: MCP3008 channel (0-7)
+            n: Number of samples to read
+            
+        Returns:
+            array('H') of raw 10-bit ADC values
+        """
+        if channel < 0 or channel > 7 or n <= 0:
+            return array('H', bytes(2 * max(n, 0)))
+        
+        fd = self._spi_fd
+        if fd is None:
+            return self._read_burst_xfer(channel, n)
+        
+        values = array('H')
+        remaining = n
+        try:
+            while remaining > 0:
+                frames = min(remaining, self.BURST_FRAMES_PER_IOCTL)
+                values.extend(self._transfer_frames(fd, channel, frames))
+                remaining -= frames
+        except (OSError, ValueError):
+            # Driver (or fcntl) refused the batched message - fall back to xfer2
+            self._burst_plans.clear()
+            self._spi_fd = None
+            values.extend(self._read_burst_xfer(channel, remaining))
+        
+        return values
+    
+    def _open_spi_fileno(self):
+        """Return the spidev file descriptor, or None if batching is unavailable."""
+        if self._ioctl is None:
+            return None
+        try:
+            return self.spi.fileno()
+        except (AttributeError, OSError):
+            return None
+    
+    def _transfer_frames(self, fd, channel, frames):
+        """Run one batched ioctl of `frames` conversions and decode the result."""
+        key = (channel, frames)
+        plan = self._burst_plans.get(key)
+        if plan is None:
+            plan = self._build_burst_plan(channel, frames)
+            self._burst_plans[key] = plan
+        
+        request, message, rx, _tx = plan
+        self._ioctl(fd, request, message)
+        
+        return array('H', [((hi & 3) << 8) | lo for hi, lo in zip(rx[1::3], rx[2::3])])
+    
+    def _build_burst_plan(self, channel, frames):
+        """Pre-pack the tx/rx buffers and spi_ioc_transfer array for a burst."""
+        tx = array('B', [1, (8 + channel) << 4, 0] * frames)
+        rx = array('B', bytes(3 * frames))
+        tx_addr = tx.buffer_info()[0]
+        rx_addr = rx.buffer_info()[0]
+        speed = self.spi.max_speed_hz
+        
+        pack = self._SPI_IOC_TRANSFER.pack
+        message = bytearray().join(
+            pack(tx_addr + 3 * i, rx_addr + 3 * i, 3, speed, 0, 8,
+                 1 if i < frames - 1 else 0, 0, 0, 0, 0)
+            for i in range(frames)
+        )
+        
+        # _IOW('k', 0, char[len(message)])
+        request = (1 << 30) | (len(message) << 16) | (ord('k') << 8)
+        
+        # tx is kept in the plan so its buffer stays alive for the kernel
+        return request, message, rx, tx
+    
+    def _read_burst_xfer(self, channel, n):
+        """Burst fallback: one xfer2 per frame, without per-call overhead."""
+        xfer2 = self.spi.xfer2
+        frame = [1, (8 + channel) << 4, 0]
+        values = array('H', bytes(2 * n))
+        for i in range(n):
+            adc = xfer2(frame)
+            values[i] = ((adc[1] & 3) << 8) | adc[2]
+        return values
+    
     def read_tds_raw(self):
         """Read raw TDS ADC value."""
         return self._read_adc(self.TDS_CHANNEL)
@@ -234,33 +689,350 @@ class HardwareSensors:
         """Read raw Turbidity ADC value (already voltage-divided)."""
         return self._read_adc(self.TURBIDITY_CHANNEL)
     
-    def read_temperature(self):
-        """Read temperature from DS18B20 sensor."""
-        if not self.ds18b20_path:
-            return 25.0  # Default fallback
+    def read_temperature(self, max_age=TEMPERATURE_MAX_AGE):
+        """
+        Read temperature from DS18B20 sensor.
         
-        try:
-            with open(self.ds18b20_path, 'r') as f:
-                lines = f.readlines()
-            
-            if lines[0].strip()[-3:] == 'YES':
-                equals_pos = lines[1].find('t=')
-                if equals_pos != -1:
-                    temp_string = lines[1][equals_pos + 2:]
-                    temp_c = float(temp_string) / 1000.0
-                    return round(temp_c, 1)
-        except:
-            pass
+        Returns instantly from the background poller's cache unless the
+        cached value is older than max_age seconds.
+        """
+        if not self.temperature_poller:
+            return TemperaturePoller.DEFAULT_TEMPERATURE  # Default fallback
         
-        return 25.0
+        return self.temperature_poller.read_temperature(max_age=max_age)
+    
+    def temperature_status(self, max_age=TEMPERATURE_MAX_AGE):
+        """
+        Temperature with its health (see TemperaturePoller.status).
+        Without a DS18B20 the default temperature is reported as stale.
+        """
+        if not self.temperature_poller:
+            return {
+                "temperature_c": TemperaturePoller.DEFAULT_TEMPERATURE,
+                "age_s": None,
+                "crc_ok": False,
+                "stale": True
+            }
+        return self.temperature_poller.status(max_age=max_age)
     
     def is_button_pressed(self):
         """Check if calibration button is pressed."""
-        return GPIO.input(self.BUTTON_PIN) == GPIO.LOW
+        return self.gpio.input(self.BUTTON_PIN) == self.gpio.LOW
     
     def cleanup(self):
-        """Clean up GPIO on exit."""
-        GPIO.cleanup()
+        """Release this probe's share of the SPI device, poller and GPIO."""
+        if self.spi is None:
+            return  # Already cleaned up
+        
+        if self.temperature_poller:
+            self._release_shared(self._temperature_pollers, self.ds18b20_path,
+                                 TemperaturePoller.stop)
+            self.temperature_poller = None
+        self._release_shared(self._spi_devices, self._spi_key, lambda spi: spi.close())
+        self._release_shared(self._gpio_users, self.backend, lambda gpio: gpio.cleanup())
+        self.spi = None
+        self._spi_fd = None
+
+
+# Binary sensor trace format
+# Header: magic + version, then (since version 2) the calibration the
+# trace was recorded with: uint32 length + Calibration.to_bytes().
+# Records: monotonic timestamp (float64), channel ID (uint8) and raw
+# value (uint16), little-endian.
+TRACE_MAGIC = b"AQTR"
+TRACE_VERSION = 2
+TRACE_HEADER = struct.Struct("<4sH")
+TRACE_CALIBRATION = struct.Struct("<I")
+TRACE_RECORD = struct.Struct("<dBH")
+
+# Trace channel IDs: ADC channels use their MCP3008 channel number
+TRACE_TDS = 0
+TRACE_TURBIDITY = 1
+TRACE_TEMPERATURE = 255
+
+# Temperature is stored as hundredths of a degree above -55°C
+# (the DS18B20's lower limit), so -55..125°C fits in a uint16.
+TRACE_TEMP_OFFSET = 55.0
+
+
+def encode_trace_temperature(temp_c):
+    """Encode a Celsius temperature as a uint16 trace value."""
+    return max(0, min(0xFFFF, int(round((temp_c + TRACE_TEMP_OFFSET) * 100))))
+
+
+def decode_trace_temperature(value):
+    """Decode a uint16 trace value back to Celsius."""
+    return round(value / 100.0 - TRACE_TEMP_OFFSET, 2)
+
+
+class TraceWriter:
+    """
+    Writes sensor samples to a compact binary trace file.
+    Safe to use from the acquisition thread and callers at the same time.
+    """
+    
+    def __init__(self, path, calibration=None):
+        """
+        Args:
+            path: Output trace path
+            calibration: Calibration the samples are converted with, stored
+                         so replay converts them the same way (default: identity)
+        """
+        self.path = Path(path)
+        calibration_data = (calibration or Calibration()).to_bytes()
+        self._file = open(self.path, 'wb')
+        self._file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        self._file.write(TRACE_CALIBRATION.pack(len(calibration_data)) + calibration_data)
+        self._lock = threading.Lock()
+        self.records = 0
+    
+    def write(self, channel, value):
+        """Record one sample, timestamped now."""
+        record = TRACE_RECORD.pack(time.monotonic(), channel, value)
+        with self._lock:
+            self._file.write(record)
+            self.records += 1
+    
+    def write_many(self, channel, values):
+        """Record a burst of samples sharing one timestamp."""
+        pack = TRACE_RECORD.pack
+        timestamp = time.monotonic()
+        data = b"".join(pack(timestamp, channel, value) for value in values)
+        with self._lock:
+            self._file.write(data)
+            self.records += len(values)
+    
+    def close(self):
+        """Flush and close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+def read_trace(path):
+    """
+    Read all records from a trace file.
+    
+    Args:
+        path: Trace file written by TraceWriter
+        
+    Returns:
+        List of (timestamp, channel, value) tuples in recording order
+        
+    Raises:
+        ValueError: If the file is not a supported trace
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    _, start = _read_trace_header(data, path)
+    
+    # Ignore a partial record left by an interrupted recording
+    end = start + (len(data) - start) // TRACE_RECORD.size * TRACE_RECORD.size
+    return list(TRACE_RECORD.iter_unpack(data[start:end]))
+
+
+def read_trace_calibration(path):
+    """
+    Get the calibration a trace was recorded with.
+    
+    Returns:
+        Calibration, or None for version 1 traces (recorded before it was stored)
+        
+    Raises:
+        ValueError: If the file is not a supported trace
+    """
+    with open(path, 'rb') as f:
+        data = f.read(TRACE_HEADER.size + TRACE_CALIBRATION.size)
+        calibration_data, _ = _read_trace_header(data + f.read(_calibration_length(data)), path)
+    
+    if calibration_data is None:
+        return None
+    return Calibration.from_bytes(calibration_data)
+
+
+def _calibration_length(data):
+    """Length of the stored calibration, given the start of a trace (0 if none)."""
+    if len(data) < TRACE_HEADER.size + TRACE_CALIBRATION.size:
+        return 0
+    if TRACE_HEADER.unpack_from(data) != (TRACE_MAGIC, TRACE_VERSION):
+        return 0
+    return TRACE_CALIBRATION.unpack_from(data, TRACE_HEADER.size)[0]
+
+
+def _read_trace_header(data, path):
+    """
+    Parse a trace header.
+    
+    Returns:
+        Tuple of (calibration bytes or None, offset of the first record)
+    """
+    if len(data) < TRACE_HEADER.size:
+        raise ValueError(f"Not a sensor trace: {path}")
+    
+    magic, version = TRACE_HEADER.unpack_from(data)
+    if magic != TRACE_MAGIC or version not in (1, TRACE_VERSION):
+        raise ValueError(f"Unsupported trace format in {path}")
+    if version == 1:
+        return None, TRACE_HEADER.size
+    
+    start = TRACE_HEADER.size + TRACE_CALIBRATION.size
+    end = start + _calibration_length(data)
+    if end > len(data):
+        raise ValueError(f"Truncated trace header in {path}")
+    return data[start:end], end
+
+
+class ReplaySensors:
+    """
+    Replays a recorded sensor trace through the driver interface.
+    Samples are returned in recording order at full speed - the original
+    timing is not reproduced.
+    """
+    
+    TDS_CHANNEL = TRACE_TDS
+    TURBIDITY_CHANNEL = TRACE_TURBIDITY
+    
+    def __init__(self, path, loop=False):
+        """
+        Args:
+            path: Trace file written by TraceWriter
+            loop: Restart from the beginning when a channel runs out
+                  (otherwise EOFError is raised)
+        """
+        self.path = Path(path)
+        self.loop = loop
+        
+        self._samples = {}
+        for _, channel, value in read_trace(self.path):
+            self._samples.setdefault(channel, array('H')).append(value)
+        self._positions = {channel: 0 for channel in self._samples}
+        self.calibration = read_trace_calibration(self.path)
+        self._last_temperature = TemperaturePoller.DEFAULT_TEMPERATURE
+        
+        counts = {channel: len(values) for channel, values in self._samples.items()}
+        print(f"⏯️  Replaying {self.path.name}: {counts}")
+    
+    def read_burst(self, channel, n):
+        """Return the next n recorded samples of a channel."""
+        values = self._samples.get(channel)
+        if not values:
+            raise EOFError(f"Trace has no samples for channel {channel}")
+        
+        pos = self._positions[channel]
+        if pos + n > len(values) and not self.loop:
+            raise EOFError(f"Trace exhausted on channel {channel}")
+        
+        burst = array('H')
+        while len(burst) < n:
+            if pos == len(values):
+                pos = 0  # Only reached when looping
+            take = min(n - len(burst), len(values) - pos)
+            burst.extend(values[pos:pos + take])
+            pos += take
+        self._positions[channel] = pos
+        return burst
+    
+    def read_tds_raw(self):
+        """Next recorded raw TDS value."""
+        return self.read_burst(TRACE_TDS, 1)[0]
+    
+    def read_turbidity_raw(self):
+        """Next recorded raw Turbidity value."""
+        return self.read_burst(TRACE_TURBIDITY, 1)[0]
+    
+    def read_temperature(self):
+        """Next recorded temperature (the last one repeats once exhausted)."""
+        values = self._samples.get(TRACE_TEMPERATURE)
+        if values:
+            pos = self._positions[TRACE_TEMPERATURE]
+            if pos < len(values):
+                self._last_temperature = decode_trace_temperature(values[pos])
+                self._positions[TRACE_TEMPERATURE] = (pos + 1) % len(values) if self.loop else pos + 1
+        return self._last_temperature
+    
+    def is_button_pressed(self):
+        """No button in replay."""
+        return False
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of raw ADC samples.
+    Storage is preallocated once; appends overwrite the oldest sample.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self._data = array('H', bytes(2 * size))
+        self._index = 0  # Next write position
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def append(self, value):
+        """Store one sample, overwriting the oldest if full."""
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.size
+        if self._count < self.size:
+            self._count += 1
+    
+    def last(self, n):
+        """
+        Get the most recent samples in chronological order.
+        
+        Args:
+            n: Number of samples wanted (capped at what is buffered)
+            
+        Returns:
+            array('H') of up to n samples, oldest first
+        """
+        n = min(n, self._count)
+        start = self._index - n
+        if start >= 0:
+            return self._data[start:self._index]
+        return self._data[start:] + self._data[:self._index]
+    
+    def clear(self):
+        """Drop all buffered samples."""
+        self._index = 0
+        self._count = 0
+    
+    def resize(self, size):
+        """Change the capacity, keeping the most recent samples."""
+        kept = self.last(size)
+        self._data = array('H', bytes(2 * size))
+        self._data[:len(kept)] = kept
+        self.size = size
+        self._count = len(kept)
+        self._index = self._count % size
+
+
+class SensorSnapshot:
+    """
+    One acquisition of every sensor channel.
+    Raw and converted values come from the same ADC sample.
+    """
+    
+    __slots__ = ("tds_raw", "tds_ppm", "turbidity_raw", "turbidity_ntu",
+                 "temperature_c", "timestamp")
+    
+    def __init__(self, tds_raw, tds_ppm, turbidity_raw, turbidity_ntu,
+                 temperature_c, timestamp):
+        self.tds_raw = tds_raw
+        self.tds_ppm = tds_ppm
+        self.turbidity_raw = turbidity_raw
+        self.turbidity_ntu = turbidity_ntu
+        self.temperature_c = temperature_c
+        self.timestamp = timestamp  # time.monotonic() at acquisition
+    
+    def as_dict(self):
+        """Get the snapshot as a plain dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __repr__(self):
+        return (f"SensorSnapshot(tds={self.tds_ppm} ppm, turbidity={self.turbidity_ntu} NTU, "
+                f"temperature={self.temperature_c}°C)")
 
 
 class SensorManager:
@@ -269,11 +1041,12 @@ class SensorManager:
     Provides unified interface regardless of hardware availability.
     """
     
-    # Conversion constants (calibrated for common sensors)
-    TDS_PPM_PER_ADC = 1000 / 1023  # 0-1000 ppm range
-    TURB_NTU_PER_ADC = 20 / 1023   # 0-20 NTU range
+    # Nominal conversion constants (see calibration.Calibration)
+    TDS_PPM_PER_ADC = Calibration.TDS_PPM_PER_ADC
+    TURB_NTU_PER_ADC = Calibration.TURB_NTU_PER_ADC
     
-    def __init__(self, simulation_scenario=None):
+    def __init__(self, simulation_scenario=None, simulation_seed=None, replay_path=None,
+                 probe=None, backend=None):
         """
         Initialize sensor manager.
         
@@ -281,18 +1054,57 @@ class SensorManager:
             simulation_scenario: Force simulation mode with specific scenario.
                                 Options: clean_water, tap_water, dirty_water, 
                                          contaminated, sensor_error
+            simulation_seed: Seed for reproducible simulated readings
+            replay_path: Replay a recorded trace instead of reading sensors
+            probe: Probe wiring for hardware mode (default: CE0, channels 0/1)
+            backend: Run the hardware driver against this HardwareBackend
+                     (e.g. fake_hardware.FakeHardware) instead of the Pi's
         """
-        self.simulation_mode = not HARDWARE_AVAILABLE or simulation_scenario is not None
+        self.probe = probe or Probe("main")
+        self.backend = backend
+        self.replay_mode = replay_path is not None
+        self.simulation_mode = not self.replay_mode and backend is None and (
+            not HARDWARE_AVAILABLE or simulation_scenario is not None
+        )
         
-        if self.simulation_mode:
+        if self.replay_mode:
+            self._driver = ReplaySensors(replay_path)
+        elif self.simulation_mode:
             scenario = simulation_scenario or "tap_water"
-            self._driver = SimulatedSensors(scenario)
+            self._driver = SimulatedSensors(scenario, seed=simulation_seed)
+        else:
+            self._driver = HardwareSensors(self.probe, backend)
+        
+        # Temperature sensor health from the last read_temperature (hardware only)
+        self.last_temperature_status = None
+        
+        # Load calibration (simulated readings are already in true units;
+        # replay converts with the calibration the trace was recorded with)
+        if self.simulation_mode:
+            self.calibration = Calibration()
+        elif self.replay_mode and self._driver.calibration is not None:
+            self.calibration = self._driver.calibration
         else:
-            self._driver = HardwareSensors()
+            self.calibration = Calibration.load(calibration_file(self.probe.name))
+        
+        # Continuous acquisition (see start_sampling)
+        self._driver_lock = threading.Lock()
+        self._buffers = {}
+        self._sample_rate = None
+        self._sampling_stop = threading.Event()
+        self._sampling_thread = None
         
-        # Load calibration offsets
-        self.tds_offset = 0
-        self.turb_offset = 0
+        # Trace recording (see start_recording)
+        self._recorder = None
+        
+        # Per-channel filter chains (see set_filter)
+        self._filters = {}
+        
+        # Multi-probe stations (see add_probe); this manager is the first probe
+        self.registry = ProbeRegistry()
+        self.registry.register(self.probe)
+        self.probes = {self.probe.name: self}
+        self._bus_executors = {}
     
     def set_scenario(self, scenario):
         """Change simulation scenario (only works in simulation mode)."""
@@ -301,61 +1113,296 @@ class SensorManager:
         else:
             print("⚠️  Cannot change scenario in hardware mode.")
     
+    def set_filter(self, channel, chain):
+        """
+        Filter a channel's samples before conversion.
+        
+        Each reading then oversamples the ADC in one burst and runs the
+        block through the chain; buffered windows are filtered the same way
+        (the ring buffers grow to hold the raw samples a window needs).
+        
+        Args:
+            channel: "tds" or "turbidity"
+            chain: filters.FilterChain, or None to remove the filter
+        """
+        if channel not in ("tds", "turbidity"):
+            raise ValueError(f"Unknown channel: {channel}")
+        
+        if chain is None:
+            self._filters.pop(channel, None)
+        else:
+            self._filters[channel] = chain
+    
+    def _acquire(self, channel, trace_channel, read_single):
+        """
+        Acquire one raw value, through the channel's filter if set.
+        Caller must hold the driver lock.
+        """
+        chain = self._filters.get(channel)
+        
+        if chain is None:
+            raw = read_single()
+            if self._recorder:
+                self._recorder.write(trace_channel, raw)
+            return raw
+        
+        adc_channel = self._driver.TDS_CHANNEL if channel == "tds" else self._driver.TURBIDITY_CHANNEL
+        block = self._driver.read_burst(adc_channel, chain.input_length(1))
+        if self._recorder:
+            self._recorder.write_many(trace_channel, block)
+        return chain.process(block)[-1]
+    
     def read_tds_raw(self):
-        """Get raw TDS ADC reading."""
-        return self._driver.read_tds_raw()
+        """Get raw TDS ADC reading (fractional if filtered)."""
+        with self._driver_lock:
+            return self._acquire("tds", TRACE_TDS, self._driver.read_tds_raw)
+    
+    def read_tds_ppm(self, temperature=None):
+        """
+        Get TDS value in ppm (parts per million).
+        
+        Args:
+            temperature: Water temperature for compensation (optional)
+        """
+        return self.calibration.tds_ppm(self.read_tds_raw(), temperature)
+    
+    def tds_ppm_from_raw(self, raw, temperature=None):
+        """Convert a raw TDS ADC value to ppm."""
+        return self.calibration.tds_ppm(raw, temperature)
     
-    def read_tds_ppm(self):
-        """Get TDS value in ppm (parts per million)."""
-        raw = self.read_tds_raw()
-        ppm = raw * self.TDS_PPM_PER_ADC + self.tds_offset
-        return max(0, round(ppm, 1))
+    def tds_ppm_from_burst(self, raws, temperature=None):
+        """Convert a burst of raw TDS ADC values to ppm."""
+        return self.calibration.tds_ppm_burst(raws, temperature)
     
     def read_turbidity_raw(self):
-        """Get raw Turbidity ADC reading."""
-        return self._driver.read_turbidity_raw()
+        """Get raw Turbidity ADC reading (fractional if filtered)."""
+        with self._driver_lock:
+            return self._acquire("turbidity", TRACE_TURBIDITY, self._driver.read_turbidity_raw)
     
     def read_turbidity_ntu(self):
         """Get Turbidity value in NTU (Nephelometric Turbidity Units)."""
-        raw = self.read_turbidity_raw()
-        ntu = raw * self.TURB_NTU_PER_ADC + self.turb_offset
-        return max(0, round(ntu, 2))
+        return self.calibration.turbidity_ntu(self.read_turbidity_raw())
+    
+    def turbidity_ntu_from_raw(self, raw):
+        """Convert a raw Turbidity ADC value to NTU."""
+        return self.calibration.turbidity_ntu(raw)
+    
+    def turbidity_ntu_from_burst(self, raws):
+        """Convert a burst of raw Turbidity ADC values to NTU."""
+        return self.calibration.turbidity_ntu_burst(raws)
+    
+    @property
+    def tds_offset(self):
+        """TDS offset in ppm, applied after the calibration curve."""
+        return self.calibration.tds.offset
+    
+    @tds_offset.setter
+    def tds_offset(self, value):
+        self.calibration.tds.offset = value
+        self.calibration.tds.invalidate()
+    
+    @property
+    def turb_offset(self):
+        """Turbidity offset in NTU, applied after the calibration curve."""
+        return self.calibration.turbidity.offset
+    
+    @turb_offset.setter
+    def turb_offset(self, value):
+        self.calibration.turbidity.offset = value
+        self.calibration.turbidity.invalidate()
     
     def read_temperature(self):
-        """Get temperature in Celsius."""
-        return self._driver.read_temperature()
+        """
+        Get temperature in Celsius.
+        
+        On hardware the sensor's health (age, CRC, staleness) is kept in
+        last_temperature_status; it stays None in simulation and replay.
+        """
+        if hasattr(self._driver, "temperature_status"):
+            self.last_temperature_status = self._driver.temperature_status()
+            temperature = self.last_temperature_status["temperature_c"]
+        else:
+            temperature = self._driver.read_temperature()
+        if self._recorder:
+            self._recorder.write(TRACE_TEMPERATURE, encode_trace_temperature(temperature))
+        return temperature
     
     def is_button_pressed(self):
         """Check if calibration button is pressed."""
         return self._driver.is_button_pressed()
     
+    def snapshot(self, temperature=None):
+        """
+        Acquire every channel once.
+        
+        Args:
+            temperature: Use this temperature instead of reading the sensor
+                         (e.g. one temperature read per analysis)
+                         
+        Returns:
+            SensorSnapshot with raw values, converted values and a
+            monotonic timestamp
+        """
+        if temperature is None:
+            temperature = self.read_temperature()
+        
+        with self._driver_lock:
+            tds_raw = self._acquire("tds", TRACE_TDS, self._driver.read_tds_raw)
+            turb_raw = self._acquire("turbidity", TRACE_TURBIDITY, self._driver.read_turbidity_raw)
+            timestamp = time.monotonic()
+        
+        calibration = self.calibration
+        return SensorSnapshot(
+            tds_raw, calibration.tds_ppm(tds_raw, temperature),
+            turb_raw, calibration.turbidity_ntu(turb_raw),
+            temperature, timestamp
+        )
+    
     def read_all(self):
         """Read all sensors at once."""
+        readings = self.snapshot().as_dict()
+        readings["timestamp"] = time.time()
+        readings["simulation_mode"] = self.simulation_mode
+        return readings
+    
+    @property
+    def sampling(self):
+        """True while the continuous acquisition thread is running."""
+        return self._sampling_thread is not None and self._sampling_thread.is_alive()
+    
+    def start_sampling(self, rate_hz=100, buffer_size=1024):
+        """
+        Start continuous acquisition into ring buffers.
+        
+        A background thread samples every channel at a fixed rate, so
+        analyses can take a window of recent samples without sleeping.
+        
+        Args:
+            rate_hz: Samples per second per channel
+            buffer_size: Samples kept per channel
+        """
+        if self.sampling:
+            return
+        
+        self._buffers = {
+            "tds": RingBuffer(buffer_size),
+            "turbidity": RingBuffer(buffer_size)
+        }
+        self._sample_rate = rate_hz
+        self._sampling_stop.clear()
+        self._sampling_thread = threading.Thread(target=self._sampling_loop, daemon=True)
+        self._sampling_thread.start()
+        print(f"🔄 Continuous sampling started ({rate_hz} Hz, {buffer_size} samples/channel)")
+    
+    def stop_sampling(self):
+        """Stop continuous acquisition (buffered samples are kept)."""
+        if not self.sampling:
+            return
+        
+        self._sampling_stop.set()
+        self._sampling_thread.join(timeout=2)
+        self._sampling_thread = None
+    
+    def _sampling_loop(self):
+        """Background loop: sample all channels on a fixed period."""
+        period = 1.0 / self._sample_rate
+        tds_buffer = self._buffers["tds"]
+        turb_buffer = self._buffers["turbidity"]
+        next_time = time.monotonic()
+        
+        while not self._sampling_stop.is_set():
+            with self._driver_lock:
+                tds_raw = self._driver.read_tds_raw()
+                turb_raw = self._driver.read_turbidity_raw()
+                tds_buffer.append(tds_raw)
+                turb_buffer.append(turb_raw)
+            
+            if self._recorder:
+                self._recorder.write(TRACE_TDS, tds_raw)
+                self._recorder.write(TRACE_TURBIDITY, turb_raw)
+            
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._sampling_stop.wait(delay)
+            else:
+                # Fell behind - restart the schedule instead of bursting
+                next_time = time.monotonic()
+    
+    def get_window(self, n, temperature=None):
+        """
+        Get the most recent buffered samples in engineering units.
+        
+        Args:
+            n: Number of samples per channel
+            temperature: Water temperature for TDS compensation (optional)
+            
+        Returns:
+            Dict with "tds" (ppm) and "turbidity" (NTU) lists, oldest first.
+            Lists are shorter than n until the buffers have filled.
+        """
+        raw = {}
+        with self._driver_lock:
+            for channel, buffer in self._buffers.items():
+                chain = self._filters.get(channel)
+                needed = chain.input_length(n) if chain else n
+                if needed > buffer.size:
+                    # A filtered window can need more raw samples than the buffer holds
+                    print(f"🔄 Growing {channel} sample buffer to {needed} samples")
+                    buffer.resize(needed)
+                raw[channel] = buffer.last(needed)
+        
+        for channel, chain in self._filters.items():
+            if channel in raw:
+                raw[channel] = chain.process(raw[channel])[-n:]
+        
         return {
-            "tds_raw": self.read_tds_raw(),
-            "tds_ppm": self.read_tds_ppm(),
-            "turbidity_raw": self.read_turbidity_raw(),
-            "turbidity_ntu": self.read_turbidity_ntu(),
-            "temperature_c": self.read_temperature(),
-            "timestamp": time.time(),
-            "simulation_mode": self.simulation_mode
+            "tds": self.tds_ppm_from_burst(raw.get("tds", []), temperature),
+            "turbidity": self.turbidity_ntu_from_burst(raw.get("turbidity", []))
         }
     
+    def start_recording(self, path):
+        """
+        Record every raw ADC sample and temperature read to a trace file.
+        
+        Args:
+            path: Output trace path (replay with SensorManager(replay_path=...))
+        """
+        self.stop_recording()
+        self._recorder = TraceWriter(path, self.calibration)
+        print(f"⏺️  Recording sensor trace to {path}")
+    
+    def stop_recording(self):
+        """Stop recording and close the trace file."""
+        if self._recorder:
+            recorder, self._recorder = self._recorder, None
+            recorder.close()
+            print(f"⏹️  Recorded {recorder.records} samples to {recorder.path}")
+    
     def calibrate_tds(self, known_ppm):
         """
         Calibrate TDS sensor with known solution.
         
+        Each call adds a point to the TDS curve: one point corrects the
+        offset, two or more fit a piecewise-linear curve.
+        
         Args:
             known_ppm: Known TDS value of calibration solution
+            
+        Returns:
+            Correction applied at this point (ppm)
         """
         # Take average of 10 readings
         readings = [self.read_tds_raw() for _ in range(10)]
         avg_raw = sum(readings) / len(readings)
-        measured_ppm = avg_raw * self.TDS_PPM_PER_ADC
+        curve = self.calibration.tds
+        measured_ppm = curve.value_at(avg_raw) * curve.scale + curve.offset
         
-        self.tds_offset = known_ppm - measured_ppm
-        print(f"📐 TDS Calibrated: offset = {self.tds_offset:.1f} ppm")
-        return self.tds_offset
+        curve.add_point(avg_raw, known_ppm)
+        correction = known_ppm - measured_ppm
+        print(f"📐 TDS Calibrated: {correction:+.1f} ppm at raw {avg_raw:.0f} "
+              f"({len(curve.points)} point(s))")
+        return correction
     
     def calibrate_turbidity(self, known_ntu):
         """
@@ -363,17 +1410,100 @@ class SensorManager:
         
         Args:
             known_ntu: Known turbidity value (0 for clear water)
+            
+        Returns:
+            Correction applied at this point (NTU)
         """
         readings = [self.read_turbidity_raw() for _ in range(10)]
         avg_raw = sum(readings) / len(readings)
-        measured_ntu = avg_raw * self.TURB_NTU_PER_ADC
+        curve = self.calibration.turbidity
+        measured_ntu = curve.value_at(avg_raw) * curve.scale + curve.offset
         
-        self.turb_offset = known_ntu - measured_ntu
-        print(f"📐 Turbidity Calibrated: offset = {self.turb_offset:.2f} NTU")
-        return self.turb_offset
+        curve.add_point(avg_raw, known_ntu)
+        correction = known_ntu - measured_ntu
+        print(f"📐 Turbidity Calibrated: {correction:+.2f} NTU at raw {avg_raw:.0f} "
+              f"({len(curve.points)} point(s))")
+        return correction
+    
+    def save_calibration(self):
+        """
+        Persist the current calibration to this probe's file
+        (calibration.json, or calibration.<probe>.json for extra probes).
+        """
+        self.calibration.save()
+    
+    def add_probe(self, probe, simulation_scenario=None, simulation_seed=None):
+        """
+        Add another probe to this station.
+        
+        Args:
+            probe: Probe wiring (chip select and channels must be free)
+            simulation_scenario: Scenario for this probe in simulation mode
+            simulation_seed: Seed for this probe in simulation mode
+            
+        Returns:
+            The SensorManager for the new probe
+        """
+        if self.replay_mode:
+            raise ValueError("Cannot add probes to a replayed trace")
+        
+        self.registry.register(probe)
+        scenario = None
+        if self.simulation_mode:
+            scenario = simulation_scenario or self._driver.scenario
+        
+        manager = SensorManager(simulation_scenario=scenario, simulation_seed=simulation_seed,
+                                probe=probe, backend=self.backend)
+        self.probes[probe.name] = manager
+        return manager
+    
+    def snapshot_all(self, temperatures=None):
+        """
+        Acquire a snapshot from every probe.
+        
+        Probes are read by one worker thread per SPI bus, so separate buses
+        are sampled concurrently while each bus is used by only one thread.
+        
+        Args:
+            temperatures: Optional dict of probe name -> temperature to use
+            
+        Returns:
+            Dict of probe name -> SensorSnapshot
+        """
+        temperatures = temperatures or {}
+        
+        def read_bus(names):
+            return [(name, self.probes[name].snapshot(temperatures.get(name))) for name in names]
+        
+        buses = self.registry.by_bus()
+        if len(buses) == 1:
+            return dict(read_bus(next(iter(buses.values()))))
+        
+        futures = [self._bus_executor(bus).submit(read_bus, names) for bus, names in buses.items()]
+        snapshots = {}
+        for future in futures:
+            snapshots.update(future.result())
+        return snapshots
+    
+    def _bus_executor(self, bus):
+        """Get the single worker thread that owns an SPI bus."""
+        executor = self._bus_executors.get(bus)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"spi{bus}")
+            self._bus_executors[bus] = executor
+        return executor
     
     def cleanup(self):
         """Clean up resources."""
+        for name, manager in self.probes.items():
+            if manager is not self:
+                manager.cleanup()
+        for executor in self._bus_executors.values():
+            executor.shutdown(wait=False)
+        self._bus_executors = {}
+        
+        self.stop_sampling()
+        self.stop_recording()
         if hasattr(self._driver, 'cleanup'):
             self._driver.cleanup()
 
@@ -393,9 +1523,9 @@ if __name__ == "__main__":
         sensors.set_scenario(scenario)
         time.sleep(0.1)
         
-        readings = sensors.read_all()
-        print(f"Scenario: {scenario:15} | TDS: {readings['tds_ppm']:6.1f} ppm | "
-              f"Turb: {readings['turbidity_ntu']:5.2f} NTU | "
-              f"Temp: {readings['temperature_c']:5.1f}°C")
+        snap = sensors.snapshot()
+        print(f"Scenario: {scenario:15} | TDS: {snap.tds_ppm:6.1f} ppm | "
+              f"Turb: {snap.turbidity_ntu:5.2f} NTU | "
+              f"Temp: {snap.temperature_c:5.1f}°C")
     
     print("\n✅ Sensor test complete!")
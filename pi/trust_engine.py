@@ -11,12 +11,231 @@ Pillars:
 5. AI Enhancement - Gemini integration (handled in mobile app)
 """
 
-import time
+import asyncio
 import json
 import math
-from pathlib import Path
+from array import array
+from types import MappingProxyType
 from datetime import datetime
-from typing import Callable, Dict, Tuple, List, Optional
+from pathlib import Path
+from typing import Callable, Dict, Tuple, List, Optional, Sequence, Union
+
+from clock import SYSTEM_CLOCK
+from history import RollupHistory
+from profile_catalog import CatalogError, ProfileCatalog, compile_profile
+
+
+class RunningStats:
+    """
+    Welford online mean/variance accumulator.
+    Numerically stable and needs no sample list.
+    """
+    
+    __slots__ = ("count", "mean", "_m2")
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+    
+    def add(self, value: float):
+        """Add one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+    
+    def remove(self, value: float):
+        """Remove one previously added observation (for sliding windows)."""
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+    
+    @property
+    def population_variance(self) -> float:
+        """Population variance (0 when empty)."""
+        return self._m2 / self.count if self.count else 0.0
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two observations)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    def ci_half_width(self, z: float = 1.96) -> float:
+        """Half-width of the confidence interval of the mean."""
+        if self.count < 2:
+            return math.inf
+        return z * math.sqrt(self.variance / self.count)
+
+
+class BurstStats:
+    """
+    Single-pass statistics of one channel's samples taken in bursts.
+    Keeps the overall, within-burst and between-burst spread without
+    storing samples - only one mean per burst.
+    """
+    
+    __slots__ = ("samples", "burst_means", "min", "max", "_burst", "_between", "_within_m2")
+    
+    def __init__(self):
+        self.samples = RunningStats()  # Every sample
+        self.burst_means: List[float] = []
+        self.min = math.inf
+        self.max = -math.inf
+        self._burst = RunningStats()  # Current burst
+        self._between = RunningStats()  # Burst means
+        self._within_m2 = 0.0
+    
+    def add(self, value: float):
+        """Add one sample to the current burst."""
+        self.samples.add(value)
+        self._burst.add(value)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def end_burst(self):
+        """Close the current burst."""
+        burst = self._burst
+        if not burst.count:
+            return
+        self.burst_means.append(burst.mean)
+        self._between.add(burst.mean)
+        self._within_m2 += burst._m2
+        self._burst = RunningStats()
+    
+    @property
+    def mean(self) -> float:
+        """Mean of the burst means."""
+        return self._between.mean
+    
+    @property
+    def within_variance(self) -> float:
+        """Pooled sample variance inside bursts (short-term sensor noise)."""
+        dof = self.samples.count - len(self.burst_means)
+        return self._within_m2 / dof if dof > 0 else 0.0
+    
+    @property
+    def between_variance(self) -> float:
+        """Sample variance of the burst means (drift across the check)."""
+        return self._between.variance
+    
+    @property
+    def burst_std(self) -> float:
+        """Population standard deviation of the burst means."""
+        return math.sqrt(self._between.population_variance)
+    
+    def summary(self) -> Dict:
+        """Statistics for reporting."""
+        if not self.samples.count:
+            return {"count": 0}
+        return {
+            "count": self.samples.count,
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+            "within_variance": round(self.within_variance, 4),
+            "between_variance": round(self.between_variance, 4)
+        }
+
+
+class SampleScheduler:
+    """
+    Monotonic-clock deadline scheduler for sampling.
+    Sleeps until the next deadline instead of for a fixed delay, so the time
+    spent reading is absorbed and the sample rate does not drift with load.
+    """
+    
+    def __init__(self, period: float, clock=None):
+        """
+        Args:
+            period: Target time between samples in seconds
+            clock: Time source (default: SYSTEM_CLOCK)
+        """
+        self.period = period
+        self.clock = clock or SYSTEM_CLOCK
+        self._deadline = 0.0
+        self._last_sample: Optional[float] = None
+        self._intervals: List[float] = []
+    
+    def start(self):
+        """Start a new schedule from now."""
+        self._deadline = self.clock.monotonic()
+        self._last_sample = None
+        self._intervals = []
+    
+    def mark_sample(self):
+        """Record that a sample was just taken."""
+        now = self.clock.monotonic()
+        if self._last_sample is not None:
+            self._intervals.append(now - self._last_sample)
+        self._last_sample = now
+    
+    def wait_next(self, gap: float = 0.0):
+        """
+        Sleep until the next sample is due.
+        
+        Args:
+            gap: Extra one-off pause (e.g. between bursts). The interval
+                 across a gap is not counted towards rate and jitter.
+        """
+        self.clock.sleep(self.next_delay(gap))
+    
+    def next_delay(self, gap: float = 0.0) -> float:
+        """
+        Advance to the next deadline and return how long to wait for it
+        (for callers that sleep themselves, e.g. with asyncio).
+        
+        Args:
+            gap: Extra one-off pause, as in wait_next
+        
+        Returns:
+            Seconds until the next sample is due (0 if already late)
+        """
+        self._deadline += self.period + gap
+        delay = self._deadline - self.clock.monotonic()
+        
+        if gap:
+            self._last_sample = None
+        
+        if delay > 0:
+            return delay
+        if -delay > self.period:
+            # More than a period late - resync rather than sample back-to-back
+            self._deadline = self.clock.monotonic()
+        return 0.0
+    
+    def report(self) -> Optional[Dict]:
+        """
+        Summarize achieved timing.
+        
+        Returns:
+            Dict with target/achieved rate and jitter percentiles in ms,
+            or None if no intervals were measured
+        """
+        intervals = self._intervals
+        if not intervals or self.period <= 0:
+            return None
+        
+        jitter = sorted(abs(interval - self.period) * 1000 for interval in intervals)
+        
+        def percentile(q: float) -> float:
+            return round(jitter[min(len(jitter) - 1, int(round(q * (len(jitter) - 1))))], 3)
+        
+        return {
+            "target_hz": round(1 / self.period, 1),
+            "achieved_hz": round(len(intervals) / sum(intervals), 1),
+            "jitter_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": round(jitter[-1], 3)
+            },
+            "intervals": len(intervals)
+        }
 
 
 class TriCheck:
@@ -25,7 +244,15 @@ class TriCheck:
     Takes burst samples to detect noise and calculate stability.
     """
     
-    def __init__(self, bursts=3, samples_per_burst=5, burst_delay=0.2, sample_delay=0.01):
+    # Adaptive mode needs two burst means for a stability score
+    MIN_ADAPTIVE_BURSTS = 2
+    
+    # Yielded by _acquisition when it needs the next sample
+    _SAMPLE = object()
+    
+    def __init__(self, bursts=3, samples_per_burst=5, burst_delay=0.2, sample_delay=0.01,
+                 adaptive=False, tolerance=0.05, max_bursts=6, z_score=1.96,
+                 resolution: Optional[Dict[str, float]] = None, clock=None):
         """
         Configure Tri-Check parameters.
         
@@ -34,11 +261,31 @@ class TriCheck:
             samples_per_burst: Samples within each burst (default 5)
             burst_delay: Delay between bursts in seconds (default 0.2)
             sample_delay: Delay between samples in seconds (default 0.01)
+            adaptive: Stop early once every channel's mean is known well
+                      enough, and keep sampling noisy signals up to max_bursts
+            tolerance: Adaptive stop when the confidence interval half-width
+                       is within this fraction of the mean (default 5%)
+            max_bursts: Adaptive burst cap (default 6)
+            z_score: Confidence level of the interval (default 1.96 = 95%)
+            resolution: Per-channel absolute half-width that is always good
+                        enough, e.g. {"turbidity": 0.25} so near-zero
+                        readings can converge (also applies to probe
+                        channels such as "inlet/turbidity")
+            clock: Time source for sample pacing (default: SYSTEM_CLOCK)
         """
         self.bursts = bursts
         self.samples_per_burst = samples_per_burst
         self.burst_delay = burst_delay
         self.sample_delay = sample_delay
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.max_bursts = max_bursts
+        self.z_score = z_score
+        self.resolution = resolution or {}
+        self.clock = clock or SYSTEM_CLOCK
+        self.bursts_taken = 0
+        self.last_timing: Optional[Dict] = None
+        self.last_stats: Dict[str, Dict] = {}
     
     def read_with_validation(self, sensor_func: Callable[[], float]) -> Tuple[float, float, List[float]]:
         """
@@ -46,34 +293,160 @@ class TriCheck:
         
         Args:
             sensor_func: A function that returns a sensor reading
-            
+        
         Returns:
             Tuple of (mean_value, stability_score_0_to_100, burst_means)
         """
-        burst_means = []
+        return self.read_channels_with_validation(lambda: {"value": sensor_func()})["value"]
+    
+    def read_channels_with_validation(
+            self, sample_func: Callable[[], Dict[str, float]]) -> Dict[str, Tuple[float, float, List[float]]]:
+        """
+        Take burst samples of several channels in one interleaved pass.
         
-        for i in range(self.bursts):
-            samples = []
-            
-            for _ in range(self.samples_per_burst):
-                samples.append(sensor_func())
-                time.sleep(self.sample_delay)
+        Every channel is sampled at each step of the same burst/sample
+        schedule, so the delays are paid once for all channels and the
+        readings stay time-aligned. In adaptive mode sampling stops after
+        any burst at which every channel's mean has converged.
+        
+        Args:
+            sample_func: A function returning one reading per channel,
+                         e.g. {"tds": 351.2, "turbidity": 1.4}
+        
+        Returns:
+            Dict of channel -> (mean_value, stability_score_0_to_100, burst_means)
+        """
+        steps = self._acquisition()
+        request = next(steps)
+        try:
+            while True:
+                if request is self._SAMPLE:
+                    request = steps.send(sample_func())
+                else:
+                    self.clock.sleep(request)
+                    request = next(steps)
+        except StopIteration as done:
+            return done.value
+    
+    async def read_channels_with_validation_async(
+            self, sample_func: Callable[[], Dict[str, float]],
+            executor=None) -> Dict[str, Tuple[float, float, List[float]]]:
+        """
+        Same as read_channels_with_validation, for asyncio: waits are
+        awaited on the clock and each (blocking) sample_func call runs
+        in an executor, so the event loop stays free between samples.
+        
+        Args:
+            sample_func: A function returning one reading per channel
+            executor: Executor for sample_func (default: the loop's)
+        
+        Returns:
+            Dict of channel -> (mean_value, stability_score_0_to_100, burst_means)
+        """
+        loop = asyncio.get_running_loop()
+        steps = self._acquisition()
+        request = next(steps)
+        try:
+            while True:
+                if request is self._SAMPLE:
+                    request = steps.send(await loop.run_in_executor(executor, sample_func))
+                else:
+                    await self.clock.sleep_async(request)
+                    request = next(steps)
+        except StopIteration as done:
+            return done.value
+    
+    def _acquisition(self):
+        """
+        The Tri-Check schedule as a generator, so it can be driven with
+        blocking or awaited sleeps. Yields either a delay in seconds to
+        wait, or _SAMPLE to be sent the next {channel: reading} dict;
+        returns the Tri-Check result.
+        """
+        adaptive = self.adaptive
+        total_bursts = max(self.max_bursts, self.MIN_ADAPTIVE_BURSTS) if adaptive else self.bursts
+        stats: Dict[str, BurstStats] = {}
+        scheduler = SampleScheduler(self.sample_delay, self.clock)
+        scheduler.start()
+        
+        for i in range(total_bursts):
+            for j in range(self.samples_per_burst):
+                # Wait for this sample's deadline (plus the burst gap at a burst start)
+                if i or j:
+                    yield scheduler.next_delay(self.burst_delay if i and not j else 0.0)
+                scheduler.mark_sample()
+                
+                readings = yield self._SAMPLE
+                for channel, value in readings.items():
+                    channel_stats = stats.get(channel)
+                    if channel_stats is None:
+                        channel_stats = stats[channel] = BurstStats()
+                    channel_stats.add(value)
             
-            burst_mean = sum(samples) / len(samples)
-            burst_means.append(burst_mean)
+            for channel_stats in stats.values():
+                channel_stats.end_burst()
             
-            if i < self.bursts - 1:
-                time.sleep(self.burst_delay)
+            self.bursts_taken = i + 1
+            if adaptive and self.bursts_taken >= self.MIN_ADAPTIVE_BURSTS and self._converged(
+                    {channel: channel_stats.samples for channel, channel_stats in stats.items()}):
+                break
+        
+        self.last_timing = scheduler.report()
+        return self._finish(stats)
+    
+    def _converged(self, sample_stats: Dict[str, "RunningStats"]) -> bool:
+        """True if every channel's mean is within tolerance at the configured confidence."""
+        return all(
+            stats.ci_half_width(self.z_score) <= max(self.tolerance * abs(stats.mean),
+                                                     self.resolution.get(channel.rsplit("/", 1)[-1], 0.0))
+            for channel, stats in sample_stats.items()
+        )
+    
+    def validate_samples(self, samples: Dict[str, List[float]]) -> Dict[str, Tuple[float, float, List[float]]]:
+        """
+        Run the Tri-Check over samples that were already acquired.
+        
+        The samples are split into `bursts` consecutive bursts of
+        `samples_per_burst` each, without any sleeping.
         
-        # Calculate overall statistics
-        overall_mean = sum(burst_means) / len(burst_means)
+        Args:
+            samples: Dict of channel -> samples, oldest first
+        
+        Returns:
+            Dict of channel -> (mean_value, stability_score_0_to_100, burst_means)
+        """
+        stats: Dict[str, BurstStats] = {}
+        
+        for channel, values in samples.items():
+            per_burst = max(1, len(values) // self.bursts)
+            channel_stats = stats[channel] = BurstStats()
+            for start in range(0, min(per_burst * self.bursts, len(values) - per_burst + 1), per_burst):
+                for k in range(start, start + per_burst):
+                    channel_stats.add(values[k])
+                channel_stats.end_burst()
+        
+        return self._finish(stats)
+    
+    def _finish(self, stats: Dict[str, BurstStats]) -> Dict[str, Tuple[float, float, List[float]]]:
+        """Summarize every channel and keep the detailed statistics."""
+        self.last_stats = {channel: channel_stats.summary() for channel, channel_stats in stats.items()}
+        return {channel: self._summarize(channel_stats) for channel, channel_stats in stats.items()}
+    
+    @property
+    def window_size(self) -> int:
+        """Number of samples one Tri-Check consumes per channel."""
+        return self.bursts * self.samples_per_burst
+    
+    @staticmethod
+    def _summarize(stats: BurstStats) -> Tuple[float, float, List[float]]:
+        """Calculate overall mean and stability score from burst statistics."""
+        burst_means = stats.burst_means
+        overall_mean = stats.mean
         
         if len(burst_means) < 2 or overall_mean == 0:
             return overall_mean, 100.0, burst_means
         
-        # Calculate standard deviation
-        variance = sum((x - overall_mean) ** 2 for x in burst_means) / len(burst_means)
-        std_dev = math.sqrt(variance)
+        std_dev = stats.burst_std
         
         # Calculate stability score
         # If std_dev is 0, score is 100
@@ -84,30 +457,144 @@ class TriCheck:
         return overall_mean, round(stability_score, 1), burst_means
 
 
+class SlidingTrend:
+    """
+    Fixed-size window of readings with running regression sums.
+    Adding a reading (and dropping the oldest) is O(1), and so is the trend.
+    
+    Readings are indexed 0..n-1 oldest first, as in a least-squares fit
+    against sample number. Σy and Σ(index * y) are kept incrementally and
+    Welford statistics give the variance; all are rebuilt from the buffer
+    once per window, or when a large reading leaves, to stop rounding drift.
+    """
+    
+    __slots__ = ("size", "_values", "_start", "count", "_sum_y", "_sum_iy", "_stats", "_updates")
+    
+    # Dropping a reading this many times larger than the window's scale
+    # triggers an exact rebuild
+    CANCELLATION_RATIO = 1e4
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._values = array('d', bytes(8 * size))
+        self._start = 0  # Buffer position of the oldest reading
+        self.count = 0
+        self._sum_y = 0.0
+        self._sum_iy = 0.0
+        self._stats = RunningStats()
+        self._updates = 0
+    
+    def add(self, value: float):
+        """Append a reading, dropping the oldest if the window is full."""
+        if self.count == self.size:
+            oldest = self._values[self._start]
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.size
+            
+            # Every remaining index shifts down by one, the new one is size - 1
+            self._sum_y -= oldest
+            self._sum_iy += (self.size - 1) * value - self._sum_y
+            self._sum_y += value
+            self._stats.remove(oldest)
+            self._stats.add(value)
+            
+            # Rebuild once per window, or at once if the dropped reading dwarfs
+            # what is left (its removal cancels most significant digits)
+            self._updates += 1
+            stats = self._stats
+            scale = abs(stats.mean) + math.sqrt(stats.population_variance)
+            if self._updates >= self.size or abs(oldest) > self.CANCELLATION_RATIO * scale:
+                self._resync()
+        else:
+            self._values[(self._start + self.count) % self.size] = value
+            self._sum_iy += self.count * value
+            self._sum_y += value
+            self.count += 1
+            self._stats.add(value)
+    
+    def values(self) -> List[float]:
+        """Readings in the window, oldest first."""
+        end = self._start + self.count
+        if end <= self.size:
+            return self._values[self._start:end].tolist()
+        return self._values[self._start:].tolist() + self._values[:end - self.size].tolist()
+    
+    def _resync(self):
+        """Recompute the running sums exactly from the buffer."""
+        values = self.values()
+        self._sum_y = math.fsum(values)
+        self._sum_iy = math.fsum(i * v for i, v in enumerate(values))
+        self._stats = RunningStats()
+        for value in values:
+            self._stats.add(value)
+        self._updates = 0
+    
+    @property
+    def mean(self) -> float:
+        return self._stats.mean
+    
+    @property
+    def population_variance(self) -> float:
+        return self._stats.population_variance
+    
+    @property
+    def slope(self) -> float:
+        """Least-squares slope per reading."""
+        n = self.count
+        if n < 2:
+            return 0.0
+        # Σx = n(n-1)/2 and Σ(x - x̄)² = n(n²-1)/12 for x = 0..n-1
+        x_mean = (n - 1) / 2
+        denominator = n * (n * n - 1) / 12
+        return (self._sum_iy - x_mean * self._sum_y) / denominator
+
+
 class StabilityTracker:
     """
     Pillar 2: Stability Index
     Tracks reading stability over time to detect sensor drift.
+    Each update and trend query is O(1), so the window can hold
+    thousands of readings for long-horizon drift detection.
     """
     
-    def __init__(self, window_size=10):
+    SENSORS = ("tds", "turbidity", "temperature")
+    
+    def __init__(self, window_size=10, max_age: Optional[float] = None, clock=None):
         """
         Args:
             window_size: Number of recent readings to track
+            max_age: Discard a sensor's history when its last reading is
+                     older than this many seconds (e.g. after the device was
+                     off for days), so trends never bridge the gap.
+                     None keeps history indefinitely.
+            clock: Time source (default: SYSTEM_CLOCK)
         """
         self.window_size = window_size
-        self.history: Dict[str, List[float]] = {
-            "tds": [],
-            "turbidity": [],
-            "temperature": []
+        self.max_age = max_age
+        self.clock = clock or SYSTEM_CLOCK
+        self._series: Dict[str, SlidingTrend] = {
+            sensor: SlidingTrend(window_size) for sensor in self.SENSORS
         }
+        self.last_updated: Dict[str, float] = {}
+    
+    @property
+    def history(self) -> Dict[str, List[float]]:
+        """Readings per sensor, oldest first."""
+        return {sensor: series.values() for sensor, series in self._series.items()}
     
     def add_reading(self, sensor: str, value: float):
         """Add a reading to the history."""
-        if sensor in self.history:
-            self.history[sensor].append(value)
-            if len(self.history[sensor]) > self.window_size:
-                self.history[sensor].pop(0)
+        series = self._series.get(sensor)
+        if series is None:
+            return
+        
+        now = self.clock.monotonic()
+        last = self.last_updated.get(sensor)
+        if self.max_age is not None and last is not None and now - last > self.max_age:
+            series = self._series[sensor] = SlidingTrend(self.window_size)
+        self.last_updated[sensor] = now
+        
+        series.add(value)
     
     def get_trend(self, sensor: str) -> Dict:
         """
@@ -116,20 +603,12 @@ class StabilityTracker:
         Returns:
             Dict with trend analysis: direction, magnitude, stability
         """
-        if sensor not in self.history or len(self.history[sensor]) < 3:
+        series = self._series.get(sensor)
+        if series is None or series.count < 3:
             return {"direction": "unknown", "magnitude": 0, "stable": True}
         
-        values = self.history[sensor]
-        
-        # Calculate linear trend
-        n = len(values)
-        x_mean = (n - 1) / 2
-        y_mean = sum(values) / n
-        
-        numerator = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(values))
-        denominator = sum((i - x_mean) ** 2 for i in range(n))
-        
-        slope = numerator / denominator if denominator != 0 else 0
+        # Linear trend
+        slope = series.slope
         
         # Determine direction
         if abs(slope) < 0.5:
@@ -140,9 +619,9 @@ class StabilityTracker:
             direction = "falling"
         
         # Calculate stability (coefficient of variation)
+        y_mean = series.mean
         if y_mean != 0:
-            variance = sum((v - y_mean) ** 2 for v in values) / n
-            cv = (math.sqrt(variance) / abs(y_mean)) * 100
+            cv = (math.sqrt(series.population_variance) / abs(y_mean)) * 100
             stable = cv < 15  # Less than 15% variation is stable
         else:
             cv = 0
@@ -153,13 +632,117 @@ class StabilityTracker:
             "magnitude": round(abs(slope), 2),
             "cv_percent": round(cv, 1),
             "stable": stable,
-            "samples": len(values)
+            "samples": series.count
         }
     
     def clear(self):
         """Clear all history."""
-        for key in self.history:
-            self.history[key] = []
+        for sensor in self._series:
+            self._series[sensor] = SlidingTrend(self.window_size)
+        self.last_updated = {}
+
+
+class ProfileSnapshot:
+    """
+    A profile compiled for one month: seasonal, normalized weights and
+    threshold reciprocals resolved once, so scoring is attribute reads.
+    Immutable - GeoProfile builds a new one when anything changes.
+    """
+    
+    __slots__ = ("name", "full_name", "zone", "month", "season", "alert", "strict_mode",
+                 "thresholds", "tds_unsafe", "turb_unsafe", "tds_risk_scale", "turb_risk_scale",
+                 "w_tds", "w_turb")
+    
+    def __init__(self, geo: "GeoProfile", month: int):
+        """
+        Args:
+            geo: GeoProfile with the profile selected
+            month: Month 1-12 to resolve seasonal weights for
+        """
+        info = geo.get_profile_info()
+        thresholds = geo.get_thresholds()
+        season, _, _, alert, w_tds, w_turb = geo.month_table()[month]
+        tds_unsafe = thresholds.get("tds_unsafe", 900)
+        turb_unsafe = thresholds.get("turb_unsafe", 10)
+        
+        values = {
+            "name": info["name"],
+            "full_name": info["full_name"],
+            "zone": info["zone"],
+            "month": month,
+            "season": season,
+            "alert": alert,
+            "strict_mode": geo.is_strict_mode(),
+            "thresholds": MappingProxyType(dict(thresholds)),
+            "tds_unsafe": tds_unsafe,
+            "turb_unsafe": turb_unsafe,
+            # Risk percent per unit (risk = value * scale, capped at 100)
+            "tds_risk_scale": 100 / tds_unsafe,
+            "turb_risk_scale": 100 / turb_unsafe,
+            "w_tds": w_tds,
+            "w_turb": w_turb
+        }
+        for slot, value in values.items():
+            object.__setattr__(self, slot, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ProfileSnapshot is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("ProfileSnapshot is immutable")
+    
+    def __repr__(self):
+        return f"ProfileSnapshot({self.name}, month={self.month}, season={self.season})"
+
+
+class ProfileMatrix:
+    """
+    Every profile in the catalog compiled for one month and stacked
+    column-wise (one entry per profile), so a reading can be scored
+    against all of them without selecting each in turn.
+    """
+    
+    def __init__(self, geo: "GeoProfile", month: int):
+        """
+        Args:
+            geo: GeoProfile whose catalog to stack (its current profile is not changed)
+            month: Month 1-12 to resolve seasonal weights for
+        """
+        self.month = month
+        self.names: List[str] = []
+        self.full_names: List[str] = []
+        self.zones: List[str] = []
+        self.seasons: List[str] = []
+        self.alerts: List[str] = []
+        self.strict_mode: List[bool] = []
+        self.tds_risk_scale = array('d')
+        self.turb_risk_scale = array('d')
+        self.w_tds = array('d')
+        self.w_turb = array('d')
+        
+        for name in geo.profiles:
+            try:
+                compiled = geo.compiled(name)
+            except ValueError as e:
+                print(f"⚠️  Skipping invalid profile {name}: {e}")
+                continue
+            profile = compiled["profile"]
+            season, _, _, alert, w_tds, w_turb = compiled["months"][month]
+            thresholds = profile.get("thresholds", {})
+            
+            self.names.append(name)
+            self.full_names.append(profile.get("name", name))
+            self.zones.append(profile.get("zone", "Unknown"))
+            self.seasons.append(season)
+            self.alerts.append(alert)
+            self.strict_mode.append(profile.get("strict_mode", True))
+            self.tds_risk_scale.append(100 / thresholds.get("tds_unsafe", 900))
+            self.turb_risk_scale.append(100 / thresholds.get("turb_unsafe", 10))
+            self.w_tds.append(w_tds)
+            self.w_turb.append(w_turb)
+    
+    def __len__(self) -> int:
+        return len(self.names)
 
 
 class GeoProfile:
@@ -168,36 +751,95 @@ class GeoProfile:
     Adjusts thresholds and weights based on regional characteristics.
     """
     
-    def __init__(self, profiles_path: Optional[str] = None):
+    def __init__(self, profiles_path: Optional[str] = None, clock=None):
         """
         Load profiles from JSON file.
         
         Args:
             profiles_path: Path to profiles.json (default: same directory)
+            clock: Time source for the current season (default: SYSTEM_CLOCK)
         """
+        self.clock = clock or SYSTEM_CLOCK
         if profiles_path is None:
             profiles_path = Path(__file__).parent / "profiles.json"
         
         self.profiles_path = Path(profiles_path)
+        self._snapshots: Dict[Tuple[str, int], ProfileSnapshot] = {}
         self._load_profiles()
         
         # Set default profile
         self.current_profile_name = self.profiles_data.get("default_profile", "JABALPUR")
-        self.current_profile = self.profiles.get(self.current_profile_name, {})
+        self._select(self.current_profile_name)
+    
+    def reload(self):
+        """Re-read profiles.json, keeping the current profile if it still exists."""
+        self._load_profiles()
+        self._select(self.current_profile_name)
+    
+    def _select(self, profile_name: str):
+        """Make a profile current, with its precompiled month table."""
+        self.current_profile_name = profile_name
+        self._snapshots = {}
+        try:
+            compiled = self.compiled(profile_name)
+        except ValueError as e:
+            print(f"⚠️  Invalid profile {profile_name}: {e}")
+            compiled = compile_profile({})
+        self.current_profile = compiled["profile"]
+        self._months = compiled["months"]
+    
+    def compiled(self, profile_name: str) -> Dict:
+        """
+        Any profile, validated, with its month table (see
+        profile_catalog.compile_profile). A missing profile compiles
+        to the defaults.
+        
+        Raises:
+            ValueError: If the profile is invalid
+        """
+        if isinstance(self.profiles, ProfileCatalog) and profile_name in self.profiles:
+            return self.profiles.compiled(profile_name)
+        return compile_profile(self.profiles.get(profile_name, {}))
+    
+    def month_table(self) -> List:
+        """
+        The current profile's compiled month table: index 1-12 holds
+        (season, tds_modifier, turb_modifier, alert, normalized tds weight,
+        normalized turbidity weight).
+        """
+        return self._months
+    
+    def snapshot(self, month: Optional[int] = None) -> ProfileSnapshot:
+        """
+        Get the current profile compiled for a month.
+        
+        Args:
+            month: Month 1-12 (default: the current month)
+        """
+        key = (self.current_profile_name, month or self.clock.now().month)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._snapshots[key] = ProfileSnapshot(self, key[1])
+        return snapshot
     
     def _load_profiles(self):
-        """Load profiles from file."""
+        """
+        Open the profile catalog. Only its cache header is read here; each
+        profile's compiled record is loaded when first selected
+        (see profile_catalog.py).
+        """
+        self._snapshots = {}
         try:
-            with open(self.profiles_path, 'r') as f:
-                self.profiles_data = json.load(f)
-                self.profiles = self.profiles_data.get("profiles", {})
-                self.bis_standards = self.profiles_data.get("bis_standards", {})
+            catalog = ProfileCatalog.open(self.profiles_path)
+            self.profiles_data = catalog.meta
+            self.profiles = catalog
+            self.bis_standards = self.profiles_data.get("bis_standards", {})
         except FileNotFoundError:
             print(f"⚠️  Profiles file not found: {self.profiles_path}")
             self.profiles_data = {}
             self.profiles = {}
             self.bis_standards = {}
-        except json.JSONDecodeError as e:
+        except CatalogError as e:
             print(f"⚠️  Error parsing profiles: {e}")
             self.profiles_data = {}
             self.profiles = {}
@@ -209,21 +851,65 @@ class GeoProfile:
         
         Args:
             profile_name: Name of the profile (e.g., "JABALPUR", "JAIPUR")
-            
+        
         Returns:
-            True if successful, False if profile not found
+            True if successful, False if profile not found or invalid
         """
         profile_name = profile_name.upper()
         
         if profile_name in self.profiles:
-            self.current_profile_name = profile_name
-            self.current_profile = self.profiles[profile_name]
+            try:
+                self.compiled(profile_name)
+            except ValueError as e:
+                print(f"⚠️  Invalid profile {profile_name}: {e}")
+                return False
+            self._select(profile_name)
             print(f"📍 Profile set to: {self.current_profile.get('name', profile_name)}")
             return True
         else:
             print(f"⚠️  Profile '{profile_name}' not found. Available: {list(self.profiles.keys())}")
             return False
     
+    def locate(self, lat: float, lon: float) -> Optional[Tuple[str, float]]:
+        """
+        Find the nearest profile that applies at a position, without
+        switching to it. Works offline from the catalog's spatial index.
+        
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+        
+        Returns:
+            Tuple of (profile name, distance in km), or None if no
+            located profile covers the position
+        """
+        if not isinstance(self.profiles, ProfileCatalog):
+            return None
+        return self.profiles.geo_index().nearest(lat, lon)
+    
+    def select_by_location(self, lat: float, lon: float) -> Optional[str]:
+        """
+        Switch to the nearest profile that applies at a GPS position.
+        
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+        
+        Returns:
+            The selected profile name, or None if none covers the position
+            (the current profile is kept)
+        """
+        found = self.locate(lat, lon)
+        if found is None:
+            print(f"⚠️  No profile covers {lat:.4f}, {lon:.4f} - keeping {self.current_profile_name}")
+            return None
+        
+        profile_name, distance_km = found
+        if profile_name != self.current_profile_name:
+            self._select(profile_name)
+        print(f"📍 Profile set to: {self.current_profile.get('name', profile_name)} ({distance_km:.1f} km)")
+        return profile_name
+    
     def get_weights(self) -> Dict[str, float]:
         """Get current sensor weights."""
         return {
@@ -243,30 +929,22 @@ class GeoProfile:
             "turb_unsafe": 10
         })
     
-    def get_seasonal_modifier(self) -> Dict:
+    def get_seasonal_modifier(self, month: Optional[int] = None) -> Dict:
         """
-        Get seasonal adjustment for current month.
+        Get seasonal adjustment for a month.
+        
+        Args:
+            month: Month 1-12 (default: the current month)
         
         Returns:
             Dict with modifiers and alert message if applicable
         """
-        current_month = datetime.now().month
-        seasonal = self.current_profile.get("seasonal_adjustments", {})
-        
-        for season, config in seasonal.items():
-            if current_month in config.get("months", []):
-                return {
-                    "season": season,
-                    "tds_modifier": config.get("tds_weight_modifier", 1.0),
-                    "turb_modifier": config.get("turb_weight_modifier", 1.0),
-                    "alert": config.get("alert", "")
-                }
-        
+        season, tds_modifier, turb_modifier, alert, _, _ = self._months[month or self.clock.now().month]
         return {
-            "season": "normal",
-            "tds_modifier": 1.0,
-            "turb_modifier": 1.0,
-            "alert": ""
+            "season": season,
+            "tds_modifier": tds_modifier,
+            "turb_modifier": turb_modifier,
+            "alert": alert
         }
     
     def is_strict_mode(self) -> bool:
@@ -293,12 +971,25 @@ class JalScoreCalculator:
     Combines all pillars to calculate the final Jal-Score.
     """
     
+    VERDICT_MESSAGES = {
+        "ERROR": "Sensor unstable - clean probe and retry",
+        "SAFE": "Water appears safe for consumption",
+        "CAUTION": "Water quality marginal - treatment recommended",
+        "UNSAFE": "Water unsafe - do not consume without treatment"
+    }
+    
+    # Local-time month lookups in calculate_many are cached per quarter hour
+    # (every UTC offset is a multiple of 15 minutes)
+    _MONTH_CACHE_SECONDS = 900
+    
     def __init__(self, geo_profile: GeoProfile):
         """
         Args:
             geo_profile: GeoProfile instance for weights and thresholds
         """
         self.geo = geo_profile
+        self._matrices: Dict[int, ProfileMatrix] = {}
+        self._matrix_source = None  # Catalog the cached matrices were built from
     
     def calculate(self, tds_ppm: float, turbidity_ntu: float, 
                   stability_score: float, temperature: float = 25.0) -> Dict:
@@ -310,26 +1001,18 @@ class JalScoreCalculator:
             turbidity_ntu: Turbidity reading in NTU
             stability_score: Sensor stability (0-100)
             temperature: Temperature in Celsius
-            
+        
         Returns:
             Dict with score, verdict, and detailed breakdown
         """
-        thresholds = self.geo.get_thresholds()
-        weights = self.geo.get_weights()
-        seasonal = self.geo.get_seasonal_modifier()
-        
-        # Apply seasonal modifiers to weights
-        w_tds = weights["tds"] * seasonal.get("tds_modifier", 1.0)
-        w_turb = weights["turbidity"] * seasonal.get("turb_modifier", 1.0)
-        
-        # Normalize weights
-        total_weight = w_tds + w_turb
-        w_tds /= total_weight
-        w_turb /= total_weight
+        # Profile with seasonal, normalized weights for this month
+        profile = self.geo.snapshot()
+        w_tds = profile.w_tds
+        w_turb = profile.w_turb
         
         # Calculate risk scores (0-100, higher = worse)
-        tds_risk = min(100, (tds_ppm / thresholds.get("tds_unsafe", 900)) * 100)
-        turb_risk = min(100, (turbidity_ntu / thresholds.get("turb_unsafe", 10)) * 100)
+        tds_risk = min(100, tds_ppm * profile.tds_risk_scale)
+        turb_risk = min(100, turbidity_ntu * profile.turb_risk_scale)
         
         # Stability penalty (if sensor is unstable, reduce confidence)
         stability_penalty = (100 - stability_score) * 0.5
@@ -341,19 +1024,16 @@ class JalScoreCalculator:
         # Determine verdict
         if stability_score < 50:
             verdict = "ERROR"
-            verdict_message = "Sensor unstable - clean probe and retry"
         elif jal_score >= 80:
             verdict = "SAFE"
-            verdict_message = "Water appears safe for consumption"
         elif jal_score >= 50:
             verdict = "CAUTION"
-            verdict_message = "Water quality marginal - treatment recommended"
         else:
             verdict = "UNSAFE"
-            verdict_message = "Water unsafe - do not consume without treatment"
+        verdict_message = self.VERDICT_MESSAGES[verdict]
         
         # Strict mode adjustments
-        if self.geo.is_strict_mode() and verdict == "CAUTION":
+        if profile.strict_mode and verdict == "CAUTION":
             # In strict mode, CAUTION becomes more serious
             verdict_message += " (Strict Mode: Consider treatment)"
         
@@ -367,10 +1047,223 @@ class JalScoreCalculator:
                 "stability_penalty": round(stability_penalty, 1),
                 "weights_used": {"tds": round(w_tds, 2), "turb": round(w_turb, 2)}
             },
-            "seasonal_alert": seasonal.get("alert", ""),
-            "profile": self.geo.get_profile_info()["full_name"],
-            "strict_mode": self.geo.is_strict_mode()
+            "seasonal_alert": profile.alert,
+            "profile": profile.full_name,
+            "strict_mode": profile.strict_mode
+        }
+    
+    def calculate_many(self, tds_ppm: Sequence[float], turbidity_ntu: Sequence[float],
+                       stability_score: Sequence[float], temperature: Optional[Sequence[float]] = None,
+                       timestamps: Optional[Sequence[Union[float, datetime]]] = None) -> Dict:
+        """
+        Score a columnar batch of readings (e.g. rescoring a year of
+        station data after a profile change).
+        
+        Gives the same scores and verdicts as calling calculate() per
+        reading, using one ProfileSnapshot per month and no per-reading
+        dicts.
+        
+        Args:
+            tds_ppm: TDS column in ppm
+            turbidity_ntu: Turbidity column in NTU
+            stability_score: Stability column (0-100)
+            temperature: Temperature column (not used by the score, as in calculate)
+            timestamps: Unix times or datetimes selecting each row's seasonal
+                        weights (default: all rows use the current month)
+        
+        Returns:
+            Dict of columns: "jal_score", "tds_risk", "turb_risk",
+            "stability_penalty" (array('d')) and "verdict" (list of str)
+        """
+        snapshots = [self.geo.snapshot(month) for month in range(1, 13)]
+        tds_scale = snapshots[0].tds_risk_scale
+        turb_scale = snapshots[0].turb_risk_scale
+        month_weights = [None] + [(snapshot.w_tds, snapshot.w_turb) for snapshot in snapshots]
+        
+        if timestamps is None:
+            months = [self.geo.clock.now().month] * len(tds_ppm)
+        else:
+            months = self._months(timestamps)
+        
+        jal_scores = []
+        tds_risks = []
+        turb_risks = []
+        penalties = []
+        verdicts = []
+        
+        for tds, turb, stability, month in zip(tds_ppm, turbidity_ntu, stability_score, months):
+            w_tds, w_turb = month_weights[month]
+            tds_risk = tds * tds_scale
+            if tds_risk > 100:
+                tds_risk = 100
+            turb_risk = turb * turb_scale
+            if turb_risk > 100:
+                turb_risk = 100
+            stability_penalty = (100 - stability) * 0.5
+            
+            jal_score = round(100 - (tds_risk * w_tds) - (turb_risk * w_turb) - stability_penalty, 1)
+            if jal_score < 0:
+                jal_score = 0
+            elif jal_score > 100:
+                jal_score = 100
+            
+            if stability < 50:
+                verdicts.append("ERROR")
+            elif jal_score >= 80:
+                verdicts.append("SAFE")
+            elif jal_score >= 50:
+                verdicts.append("CAUTION")
+            else:
+                verdicts.append("UNSAFE")
+            
+            jal_scores.append(jal_score)
+            tds_risks.append(tds_risk)
+            turb_risks.append(turb_risk)
+            penalties.append(stability_penalty)
+        
+        return {
+            "jal_score": array('d', jal_scores),
+            "verdict": verdicts,
+            "tds_risk": array('d', tds_risks),
+            "turb_risk": array('d', turb_risks),
+            "stability_penalty": array('d', penalties)
         }
+    
+    def profile_matrix(self, month: Optional[int] = None) -> ProfileMatrix:
+        """
+        All profiles stacked for a month, rebuilt only when the catalog changes.
+        
+        Args:
+            month: Month 1-12 (default: the current month)
+        """
+        if self._matrix_source is not self.geo.profiles:
+            self._matrices = {}
+            self._matrix_source = self.geo.profiles
+        
+        month = month or self.geo.clock.now().month
+        matrix = self._matrices.get(month)
+        if matrix is None:
+            matrix = self._matrices[month] = ProfileMatrix(self.geo, month)
+        return matrix
+    
+    def score_across_profiles(self, reading: Dict, month: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Score a reading - or a batch of readings - under every profile,
+        without changing the current profile.
+        
+        Scores and verdicts match set_profile() + calculate() for each
+        profile in turn.
+        
+        Args:
+            reading: Dict with "tds_ppm", "turbidity_ntu" and optionally
+                     "stability_score" (default 100, e.g. a lab sample),
+                     each a number or a column of numbers
+            month: Month 1-12 for seasonal weights (default: the current month)
+        
+        Returns:
+            Dict of profile name -> {"jal_score", "verdict", "tds_risk",
+            "turb_risk", "stability_penalty", "profile", "zone", "season",
+            "seasonal_alert", "strict_mode"}. For a batch the score, verdict
+            and risk entries are columns (array('d') / list of str).
+        """
+        matrix = self.profile_matrix(month)
+        
+        tds_ppm = reading["tds_ppm"]
+        turbidity_ntu = reading["turbidity_ntu"]
+        stability_score = reading.get("stability_score", 100.0)
+        single = isinstance(tds_ppm, (int, float))
+        if single:
+            tds_ppm, turbidity_ntu, stability_score = [tds_ppm], [turbidity_ntu], [stability_score]
+        elif isinstance(stability_score, (int, float)):
+            stability_score = [stability_score] * len(tds_ppm)
+        
+        # Per-reading terms shared by every profile
+        penalties = [(100 - stability) * 0.5 for stability in stability_score]
+        errors = [stability < 50 for stability in stability_score]
+        rows = list(zip(tds_ppm, turbidity_ntu, penalties, errors))
+        
+        results = {}
+        for j, name in enumerate(matrix.names):
+            tds_scale = matrix.tds_risk_scale[j]
+            turb_scale = matrix.turb_risk_scale[j]
+            w_tds = matrix.w_tds[j]
+            w_turb = matrix.w_turb[j]
+            
+            jal_scores = []
+            tds_risks = []
+            turb_risks = []
+            verdicts = []
+            for tds, turb, stability_penalty, error in rows:
+                tds_risk = tds * tds_scale
+                if tds_risk > 100:
+                    tds_risk = 100
+                turb_risk = turb * turb_scale
+                if turb_risk > 100:
+                    turb_risk = 100
+                
+                jal_score = round(100 - (tds_risk * w_tds) - (turb_risk * w_turb) - stability_penalty, 1)
+                if jal_score < 0:
+                    jal_score = 0
+                elif jal_score > 100:
+                    jal_score = 100
+                
+                if error:
+                    verdicts.append("ERROR")
+                elif jal_score >= 80:
+                    verdicts.append("SAFE")
+                elif jal_score >= 50:
+                    verdicts.append("CAUTION")
+                else:
+                    verdicts.append("UNSAFE")
+                
+                jal_scores.append(jal_score)
+                tds_risks.append(tds_risk)
+                turb_risks.append(turb_risk)
+            
+            if single:
+                result = {
+                    "jal_score": jal_scores[0],
+                    "verdict": verdicts[0],
+                    "tds_risk": round(tds_risks[0], 1),
+                    "turb_risk": round(turb_risks[0], 1),
+                    "stability_penalty": round(penalties[0], 1)
+                }
+            else:
+                result = {
+                    "jal_score": array('d', jal_scores),
+                    "verdict": verdicts,
+                    "tds_risk": array('d', tds_risks),
+                    "turb_risk": array('d', turb_risks),
+                    "stability_penalty": array('d', penalties)
+                }
+            result.update({
+                "profile": matrix.full_names[j],
+                "zone": matrix.zones[j],
+                "season": matrix.seasons[j],
+                "seasonal_alert": matrix.alerts[j],
+                "strict_mode": matrix.strict_mode[j]
+            })
+            results[name] = result
+        
+        return results
+    
+    def _months(self, timestamps: Sequence[Union[float, datetime]]) -> List[int]:
+        """Local month (1-12) of every timestamp."""
+        step = self._MONTH_CACHE_SECONDS
+        cache: Dict[int, int] = {}
+        months = []
+        
+        for ts in timestamps:
+            if isinstance(ts, datetime):
+                months.append(ts.month)
+                continue
+            key = int(ts // step)
+            month = cache.get(key)
+            if month is None:
+                month = cache[key] = datetime.fromtimestamp(key * step).month
+            months.append(month)
+        
+        return months
 
 
 class TrustEngine:
@@ -378,18 +1271,34 @@ class TrustEngine:
     Main Trust Engine - combines all pillars for complete analysis.
     """
     
-    def __init__(self, sensor_manager, profile_name: str = None):
+    # Adaptive Tri-Check: precision that is always sufficient for scoring
+    ADAPTIVE_RESOLUTION = {"tds": 10.0, "turbidity": 0.25}
+    
+    def __init__(self, sensor_manager, profile_name: str = None, adaptive: bool = False,
+                 clock=None):
         """
         Initialize the Trust Engine.
         
         Args:
             sensor_manager: SensorManager instance
             profile_name: Optional profile name to use
+            adaptive: Use adaptive early-stopping Tri-Check
+            clock: Time source (default: SYSTEM_CLOCK; a VirtualClock makes
+                   simulated analyses run without sleeping)
         """
         self.sensors = sensor_manager
-        self.tri_check = TriCheck()
-        self.stability_tracker = StabilityTracker()
-        self.geo_profile = GeoProfile()
+        self.clock = clock or SYSTEM_CLOCK
+        delays = {}
+        if getattr(sensor_manager, "replay_mode", False):
+            # Recorded samples are already spaced in time - replay at full speed
+            delays = {"burst_delay": 0, "sample_delay": 0}
+        self.tri_check = TriCheck(adaptive=adaptive, resolution=self.ADAPTIVE_RESOLUTION,
+                                  clock=self.clock, **delays)
+        self.stability_tracker = StabilityTracker(clock=self.clock)
+        self.probe_trackers: Dict[str, StabilityTracker] = {}
+        self.history = RollupHistory(clock=self.clock)
+        self.probe_histories: Dict[str, RollupHistory] = {}
+        self.geo_profile = GeoProfile(clock=self.clock)
         self.jal_calculator = JalScoreCalculator(self.geo_profile)
         
         if profile_name:
@@ -399,6 +1308,18 @@ class TrustEngine:
         """Change the regional profile."""
         return self.geo_profile.set_profile(profile_name)
     
+    def select_by_location(self, lat: float, lon: float) -> Optional[str]:
+        """Change to the regional profile for a GPS position."""
+        return self.geo_profile.select_by_location(lat, lon)
+    
+    def _sample_channels(self, temperature: float) -> Dict[str, float]:
+        """Read one time-aligned sample of every Tri-Check channel."""
+        snapshot = self.sensors.snapshot(temperature)
+        return {
+            "tds": snapshot.tds_ppm,
+            "turbidity": snapshot.turbidity_ntu
+        }
+    
     def analyze_water(self) -> Dict:
         """
         Perform complete water quality analysis.
@@ -406,34 +1327,186 @@ class TrustEngine:
         Returns:
             Complete analysis result with all data and recommendations
         """
+        return self.score(self.acquire())
+    
+    def acquire(self) -> Dict:
+        """
+        Take the sensor readings for one analysis, without scoring them.
+        
+        Acquisition and scoring are split so a pipelined caller can score
+        one reading while the next is acquired (see score).
+        
+        Returns:
+            Acquisition to pass to score
+        """
         print("\n🔬 Starting water analysis...")
         print("=" * 40)
         
-        # Pillar 1: Tri-Check for TDS
-        print("📊 Running TDS Tri-Check...")
-        tds_mean, tds_stability, tds_bursts = self.tri_check.read_with_validation(
-            self.sensors.read_tds_ppm
-        )
+        # Temperature first (cached on hardware) - TDS is compensated with it
+        temperature = self.sensors.read_temperature()
         
-        # Pillar 1: Tri-Check for Turbidity
-        print("📊 Running Turbidity Tri-Check...")
-        turb_mean, turb_stability, turb_bursts = self.tri_check.read_with_validation(
-            self.sensors.read_turbidity_ntu
-        )
+        # Pillar 1: Tri-Check for TDS and Turbidity in one interleaved pass
+        channels = self._buffered_channels(temperature)
+        timing = None
+        if channels is None:
+            print("📊 Running TDS + Turbidity Tri-Check...")
+            channels = self.tri_check.read_channels_with_validation(
+                lambda: self._sample_channels(temperature)
+            )
+            timing = self.tri_check.last_timing
         
-        # Get temperature (single read is fine for temp)
-        temperature = self.sensors.read_temperature()
+        return self._acquisition(channels, temperature, timing)
+    
+    def _acquisition(self, channels: Dict[str, Tuple[float, float, List[float]]],
+                     temperature: float, timing: Optional[Dict]) -> Dict:
+        """Bundle a finished Tri-Check with the state scoring needs later."""
+        return {
+            "channels": channels,
+            "temperature": temperature,
+            "timing": timing,
+            "stats": self.tri_check.last_stats,
+            "temperature_status": self.sensors.last_temperature_status,
+            "acquired_at": self.clock.now()
+        }
+    
+    def score(self, acquisition: Dict) -> Dict:
+        """
+        Score an acquisition: stability trends, history and Jal-Score.
+        
+        Args:
+            acquisition: Result of acquire
+        
+        Returns:
+            Complete analysis result (same format as analyze_water)
+        """
+        result = self._build_result(acquisition["channels"], acquisition["temperature"],
+                                    acquisition["timing"], self.stability_tracker, self.history,
+                                    acquisition["stats"], acquisition["temperature_status"],
+                                    acquisition["acquired_at"])
+        self._print_result(result)
+        return result
+    
+    async def analyze_water_async(self, executor=None) -> Dict:
+        """
+        Perform complete water quality analysis without blocking the
+        event loop: Tri-Check waits are awaited and the temperature and
+        sensor reads run in an executor, so an asyncio host can keep
+        serving Bluetooth, a display or an API meanwhile.
+        
+        Args:
+            executor: Executor for blocking sensor reads (default: the loop's)
+        
+        Returns:
+            Complete analysis result (same format as analyze_water)
+        """
+        print("\n🔬 Starting water analysis...")
+        print("=" * 40)
+        
+        loop = asyncio.get_running_loop()
+        temperature = await loop.run_in_executor(executor, self.sensors.read_temperature)
+        
+        channels = self._buffered_channels(temperature)
+        timing = None
+        if channels is None:
+            print("📊 Running TDS + Turbidity Tri-Check...")
+            channels = await self.tri_check.read_channels_with_validation_async(
+                lambda: self._sample_channels(temperature), executor
+            )
+            timing = self.tri_check.last_timing
+        
+        return self.score(self._acquisition(channels, temperature, timing))
+    
+    def _buffered_channels(self, temperature: float) -> Optional[Dict[str, Tuple[float, float, List[float]]]]:
+        """Tri-Check over the background sampling buffer, or None if it isn't full."""
+        if not getattr(self.sensors, "sampling", False):
+            return None
+        window = self.sensors.get_window(self.tri_check.window_size, temperature)
+        if min(len(values) for values in window.values()) < self.tri_check.window_size:
+            return None
+        print("📊 Running TDS + Turbidity Tri-Check on buffered samples...")
+        return self.tri_check.validate_samples(window)
+    
+    def analyze_probes(self) -> Dict[str, Dict]:
+        """
+        Analyze every probe of a multi-probe station in one Tri-Check pass.
+        
+        All probes are sampled at each step of the same burst schedule
+        (buses in parallel, see SensorManager.snapshot_all), and each probe
+        keeps its own stability history.
+        
+        Returns:
+            Dict of probe name -> analysis result (same format as analyze_water)
+        """
+        probes = self.sensors.probes
+        print(f"\n🔬 Starting water analysis of {len(probes)} probes...")
+        print("=" * 40)
+        
+        temperatures = {name: manager.read_temperature() for name, manager in probes.items()}
+        
+        def sample_all() -> Dict[str, float]:
+            samples = {}
+            for name, snapshot in self.sensors.snapshot_all(temperatures).items():
+                samples[f"{name}/tds"] = snapshot.tds_ppm
+                samples[f"{name}/turbidity"] = snapshot.turbidity_ntu
+            return samples
+        
+        print("📊 Running TDS + Turbidity Tri-Check on all probes...")
+        channels = self.tri_check.read_channels_with_validation(sample_all)
+        timing = self.tri_check.last_timing
+        
+        results = {}
+        for name in probes:
+            tracker = self.probe_trackers.get(name)
+            if tracker is None:
+                tracker = self.probe_trackers[name] = StabilityTracker(clock=self.clock)
+                self.probe_histories[name] = RollupHistory(clock=self.clock)
+            probe_channels = {
+                "tds": channels[f"{name}/tds"],
+                "turbidity": channels[f"{name}/turbidity"]
+            }
+            probe_stats = {
+                "tds": self.tri_check.last_stats[f"{name}/tds"],
+                "turbidity": self.tri_check.last_stats[f"{name}/turbidity"]
+            }
+            result = self._build_result(probe_channels, temperatures[name], timing, tracker,
+                                        self.probe_histories[name], probe_stats,
+                                        probes[name].last_temperature_status)
+            result["probe"] = name
+            print(f"\n📍 Probe '{name}':")
+            self._print_result(result)
+            results[name] = result
+        
+        return results
+    
+    def _build_result(self, channels: Dict[str, Tuple[float, float, List[float]]],
+                      temperature: float, timing: Optional[Dict],
+                      tracker: StabilityTracker, history: RollupHistory,
+                      stats: Dict[str, Dict], temperature_status: Optional[Dict] = None,
+                      acquired_at: Optional[datetime] = None) -> Dict:
+        """Score Tri-Check results and compile the analysis result."""
+        if acquired_at is None:
+            acquired_at = self.clock.now()
+        
+        tds_mean, tds_stability, tds_bursts = channels["tds"]
+        turb_mean, turb_stability, turb_bursts = channels["turbidity"]
         
         # Combined stability score
         overall_stability = (tds_stability + turb_stability) / 2
         
         # Pillar 2: Update stability tracker
-        self.stability_tracker.add_reading("tds", tds_mean)
-        self.stability_tracker.add_reading("turbidity", turb_mean)
-        self.stability_tracker.add_reading("temperature", temperature)
+        tracker.add_reading("tds", tds_mean)
+        tracker.add_reading("turbidity", turb_mean)
+        tracker.add_reading("temperature", temperature)
+        
+        # Long-term rollups (minute/hour/day buckets)
+        history.add_readings({
+            "tds": tds_mean,
+            "turbidity": turb_mean,
+            "temperature": temperature
+        }, acquired_at.timestamp())
         
-        tds_trend = self.stability_tracker.get_trend("tds")
-        turb_trend = self.stability_tracker.get_trend("turbidity")
+        tds_trend = tracker.get_trend("tds")
+        turb_trend = tracker.get_trend("turbidity")
         
         # Pillar 3 & 4: Calculate Jal-Score with geo-profile
         jal_result = self.jal_calculator.calculate(
@@ -442,7 +1515,7 @@ class TrustEngine:
         
         # Compile complete result
         result = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": acquired_at.isoformat(),
             "readings": {
                 "tds_ppm": round(tds_mean, 1),
                 "turbidity_ntu": round(turb_mean, 2),
@@ -465,25 +1538,34 @@ class TrustEngine:
             "seasonal_alert": jal_result["seasonal_alert"],
             "strict_mode": jal_result["strict_mode"],
             "simulation_mode": self.sensors.simulation_mode,
+            "timing": timing,
             "raw_data": {
                 "tds_bursts": [round(b, 1) for b in tds_bursts],
-                "turb_bursts": [round(b, 2) for b in turb_bursts]
+                "turb_bursts": [round(b, 2) for b in turb_bursts],
+                "tds_stats": stats.get("tds"),
+                "turb_stats": stats.get("turbidity"),
+                "temperature_status": temperature_status
             }
         }
         
-        # Print summary
+        return result
+    
+    def _print_result(self, result: Dict):
+        """Print an analysis result summary."""
         print(f"\n✅ Analysis Complete!")
-        print(f"   TDS: {result['readings']['tds_ppm']} ppm (stability: {tds_stability}%)")
-        print(f"   Turbidity: {result['readings']['turbidity_ntu']} NTU (stability: {turb_stability}%)")
-        print(f"   Temperature: {temperature}°C")
+        print(f"   TDS: {result['readings']['tds_ppm']} ppm (stability: {result['stability']['tds_stability']}%)")
+        print(f"   Turbidity: {result['readings']['turbidity_ntu']} NTU (stability: {result['stability']['turb_stability']}%)")
+        print(f"   Temperature: {result['readings']['temperature_c']}°C")
+        temperature_status = result["raw_data"]["temperature_status"]
+        if temperature_status and temperature_status["stale"]:
+            print(f"   ⚠️  Temperature sensor not responding (CRC ok: {temperature_status['crc_ok']}, "
+                  f"last good read: {temperature_status['age_s']}s ago) - using default")
         print(f"\n   🎯 JAL-SCORE: {result['jal_score']}")
         print(f"   📋 VERDICT: {result['verdict']}")
         print(f"   💬 {result['verdict_message']}")
         
         if result['seasonal_alert']:
             print(f"\n   ⚠️  SEASONAL ALERT: {result['seasonal_alert']}")
-        
-        return result
 
 
 # Quick test when run directly